@@ -3,6 +3,7 @@
 import random
 import time
 import os
+import sys
 
 import numpy as np
 import pandas as pd
@@ -10,6 +11,12 @@ from deap import algorithms, base, creator, tools
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+# Zajednički Monte Carlo modul nalazi se u mapi 'kodovi'
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "kodovi"))
+import aktivnosti  # noqa: E402
+import monte_carlo  # noqa: E402
+import ucitavanje  # noqa: E402
+
 # ==============================================================================
 # KONFIGURACIJA
 # ==============================================================================
@@ -17,6 +24,9 @@ CONFIG = {
     "SEED": 42,
     "RUNS": 10,  # Broj ponavljanja
     "NUM_SIMULATIONS": 100,  # Monte Carlo iteracije
+    # Scenarij s "DATA_PATH" (.csv, .parquet ili pretvorena instanca) umjesto
+    # NUM_ACTIVITIES učitava stvarni portfelj; DATA_CACHE je direktorij pretvorenih tablica
+    "DATA_CACHE": None,
     "experimental_series": [
         {"name": "A1_Osnovni", "NUM_ACTIVITIES": 10, "BUDGET": 1000},
         {"name": "A2_Srednji", "NUM_ACTIVITIES": 50, "BUDGET": 2500},
@@ -34,6 +44,7 @@ MUT_PB = 0.2
 
 random.seed(CONFIG["SEED"])
 np.random.seed(CONFIG["SEED"])
+monte_carlo.seed(CONFIG["SEED"])
 
 # ==============================================================================
 # DEAP STRUKTURE
@@ -61,7 +72,7 @@ def generate_data(num_activities):
             "pessimistic": pessimistic,
             "roi": roi,
         })
-    return data
+    return aktivnosti.ActivitySet.from_dicts(data)
 
 # ==============================================================================
 # EKSPERIMENT: Ablacijska studija za više scenarija
@@ -81,38 +92,36 @@ def run_ablation_study():
     all_results = []
 
     for scenario in CONFIG["experimental_series"]:
+        # Učitaj portfelj ili generiraj aktivnosti
+        if scenario.get("DATA_PATH") is not None:
+            activities = ucitavanje.load(scenario["DATA_PATH"], cache_dir=CONFIG["DATA_CACHE"])
+        else:
+            activities = generate_data(scenario["NUM_ACTIVITIES"])
+        num_activities = len(activities)
         print(f"\n>>> Pokrećem scenarij: {scenario['name']} | "
-              f"Activities={scenario['NUM_ACTIVITIES']} | Budget={scenario['BUDGET']}")
-
-        # Generiraj aktivnosti
-        activities = generate_data(scenario["NUM_ACTIVITIES"])
+              f"Activities={num_activities} | Budget={scenario['BUDGET']}")
 
         # DEAP toolbox
         toolbox = base.Toolbox()
         toolbox.register("attr_bool", random.randint, 0, 1)
-        toolbox.register("individual", tools.initRepeat, creator.Individual, toolbox.attr_bool, scenario["NUM_ACTIVITIES"])
+        toolbox.register("individual", tools.initRepeat, creator.Individual, toolbox.attr_bool, num_activities)
         toolbox.register("population", tools.initRepeat, list, toolbox.individual)
         toolbox.register("mate", tools.cxTwoPoint)
         toolbox.register("mutate", tools.mutFlipBit, indpb=0.1)
 
         # Fitness funkcija po scenariju
         def single_objective_fitness_scenario(individual):
-            total_cost = sum(activities[i]["cost"] for i, sel in enumerate(individual) if sel)
-            total_roi = sum(activities[i]["roi"] for i, sel in enumerate(individual) if sel)
+            mask = np.asarray(individual, dtype=bool)
+            total_cost = activities.cost[mask].sum()
+            total_roi = activities.roi[mask].sum()
             if total_cost > scenario["BUDGET"]:
                 return (-(total_cost - scenario["BUDGET"]),)
             return (total_roi,)
 
         def monte_carlo_eval_duration_scenario(individual):
-            selected = [act for i, act in enumerate(activities) if individual[i] == 1]
-            if not selected:
-                return 0.0
-            durations = [
-                sum(random.triangular(act["optimistic"], act["pessimistic"], act["realistic"])
-                    for act in selected)
-                for _ in range(CONFIG["NUM_SIMULATIONS"])
-            ]
-            return np.mean(durations)
+            return monte_carlo.monte_carlo_eval_duration(
+                individual, activities, CONFIG["NUM_SIMULATIONS"]
+            )
 
         toolbox.register("evaluate", single_objective_fitness_scenario)
         toolbox.register("select", tools.selTournament, tournsize=3)
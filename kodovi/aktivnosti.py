@@ -0,0 +1,196 @@
+"""Aktivnosti instance kao stupci NumPy nizova - zajednički modul - diplomski rad - Neven Nižić"""
+
+from collections.abc import Mapping
+import os
+
+import numpy as np
+
+# Brojčani atributi aktivnosti (ključevi rječnika i nazivi stupaca)
+FIELDS = ("cost", "optimistic", "realistic", "pessimistic", "roi")
+
+# Stupci koji se spremaju na disk (izvedena polja računaju se pri učitavanju)
+COLUMNS = ("ids",) + FIELDS + ("predecessor_offsets", "predecessor_indices")
+
+
+class ActivityView(Mapping):
+    """Pogled na jednu aktivnost s istim ključevima kao rječnik iz generate_data.
+
+    Služi kodu koji još očekuje listu rječnika; vrijednosti se čitaju iz
+    stupaca pa se ništa ne kopira.
+    """
+
+    __slots__ = ("activities", "index")
+
+    def __init__(self, activities, index):
+        self.activities = activities
+        self.index = index
+
+    def __getitem__(self, key):
+        if key == "id":
+            return int(self.activities.ids[self.index])
+        if key == "predecessors":
+            return self.activities.predecessors(self.index)
+        if key in FIELDS:
+            return getattr(self.activities, key)[self.index].item()
+        raise KeyError(key)
+
+    def __iter__(self):
+        yield "id"
+        yield from FIELDS
+        yield "predecessors"
+
+    def __len__(self):
+        return len(FIELDS) + 2
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class ActivitySet:
+    """Aktivnosti instance kao niz stupaca (struct of arrays).
+
+    Svaki atribut (cost, roi, optimistic, realistic, pessimistic, ids) je
+    jedan kontinuirani NumPy niz, a prethodnici su u CSR obliku (pomaci i
+    indeksi). Izvedena polja mean_duration (očekivanje trokutaste razdiobe)
+    i ratio (ROI/trošak) računaju se jednom. Indeksiranje i iteracija vraćaju
+    ActivityView, pa postojeći kod s act["cost"] radi bez izmjena.
+
+    Stupci se spremaju kao .npz ili kao direktorij .npy datoteka; potonji se
+    učitava memorijskim mapiranjem, a takav skup se prema drugim procesima
+    pickla samo kao putanja ('source').
+    """
+
+    def __init__(
+        self,
+        cost,
+        roi,
+        optimistic,
+        realistic,
+        pessimistic,
+        ids=None,
+        predecessors=None,
+    ):
+        self.cost = np.ascontiguousarray(cost, dtype=float)
+        self.roi = np.ascontiguousarray(roi, dtype=float)
+        self.optimistic = np.ascontiguousarray(optimistic, dtype=float)
+        self.realistic = np.ascontiguousarray(realistic, dtype=float)
+        self.pessimistic = np.ascontiguousarray(pessimistic, dtype=float)
+        size = len(self.cost)
+        self.ids = np.arange(size) if ids is None else np.asarray(ids, dtype=np.int64)
+        predecessors = (
+            [[] for _ in range(size)] if predecessors is None else predecessors
+        )
+        self.predecessor_offsets = np.zeros(size + 1, dtype=np.int64)
+        self.predecessor_offsets[1:] = np.cumsum([len(p) for p in predecessors])
+        self.predecessor_indices = np.array(
+            [p for preds in predecessors for p in preds], dtype=np.int64
+        )
+        self.source = None
+        self._derive()
+
+    def _derive(self):
+        """Računa izvedena polja iz stupaca."""
+        size = len(self.cost)
+        self.mean_duration = (self.optimistic + self.realistic + self.pessimistic) / 3
+        self.ratio = np.divide(
+            self.roi, self.cost, out=np.zeros(size), where=self.cost > 0
+        )
+
+    @classmethod
+    def from_dicts(cls, activities):
+        """ActivitySet iz liste rječnika (format generate_data)."""
+        columns = {
+            field: [act[field] for act in activities] for field in ("id",) + FIELDS
+        }
+        return cls(
+            columns["cost"],
+            columns["roi"],
+            columns["optimistic"],
+            columns["realistic"],
+            columns["pessimistic"],
+            ids=columns["id"],
+            predecessors=[list(act.get("predecessors", [])) for act in activities],
+        )
+
+    @classmethod
+    def from_columns(cls, columns, source=None):
+        """ActivitySet iz rječnika stupaca (COLUMNS) bez kopiranja nizova."""
+        activities = cls.__new__(cls)
+        for name in COLUMNS:
+            setattr(activities, name, columns[name])
+        activities.source = source
+        activities._derive()
+        return activities
+
+    def columns(self):
+        """Rječnik spremljenih stupaca (COLUMNS)."""
+        return {name: getattr(self, name) for name in COLUMNS}
+
+    def save(self, path):
+        """Sprema stupce u .npz datoteku ili u direktorij .npy datoteka.
+
+        Putanja koja završava na .npz daje jednu datoteku; inače se stvara
+        direktorij s jednom .npy datotekom po stupcu (za memorijsko mapiranje).
+        """
+        if path.endswith(".npz"):
+            with open(path, "wb") as file:
+                np.savez(file, **self.columns())
+            return
+        os.makedirs(path, exist_ok=True)
+        for name, array in self.columns().items():
+            np.save(os.path.join(path, f"{name}.npy"), array)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Učitava stupce spremljene sa save().
+
+        Direktorij se uz mmap=True memorijski mapira (samo za čitanje), pa se
+        podatci čitaju s diska tek kad zatrebaju.
+        """
+        if path.endswith(".npz"):
+            with np.load(path) as data:
+                return cls.from_columns({name: data[name] for name in COLUMNS})
+        mode = "r" if mmap else None
+        columns = {
+            name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mode)
+            for name in COLUMNS
+        }
+        return cls.from_columns(columns, source=path if mmap else None)
+
+    def __reduce_ex__(self, protocol):
+        # Mapirani skup se u drugom procesu ponovno mapira umjesto kopiranja
+        if self.source is not None:
+            return (self.load, (self.source,))
+        return super().__reduce_ex__(protocol)
+
+    def to_dicts(self):
+        """Lista rječnika (za kod i izvoze koji očekuju stari format)."""
+        return [dict(view) for view in self]
+
+    def predecessors(self, index):
+        """Lista indeksa prethodnika aktivnosti 'index'."""
+        start, end = self.predecessor_offsets[index : index + 2]
+        return self.predecessor_indices[start:end].tolist()
+
+    def predecessor_lists(self):
+        """Prethodnici svih aktivnosti (lista listi)."""
+        return [self.predecessors(i) for i in range(len(self))]
+
+    @property
+    def nbytes(self):
+        """Memorija svih stupaca u bajtovima."""
+        arrays = [getattr(self, field) for field in FIELDS]
+        arrays += [self.ids, self.mean_duration, self.ratio]
+        arrays += [self.predecessor_offsets, self.predecessor_indices]
+        return sum(array.nbytes for array in arrays)
+
+    def __len__(self):
+        return len(self.cost)
+
+    def __getitem__(self, index):
+        if not -len(self) <= index < len(self):
+            raise IndexError(index)
+        return ActivityView(self, index % len(self))
+
+    def __iter__(self):
+        return (ActivityView(self, i) for i in range(len(self)))
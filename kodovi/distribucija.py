@@ -0,0 +1,218 @@
+"""Razdioba ukupnog trajanja konvolucijom (FFT) - zajednički modul - diplomski rad - Neven Nižić"""
+
+import numpy as np
+
+import monte_carlo
+
+# Zadani korak mreže diskretizacije (u jedinicama trajanja)
+DEFAULT_GRID_STEP = 0.5
+
+# Ispod ove duljine izravna konvolucija brža je od FFT-a
+_DIRECT_CONVOLUTION = 64
+
+
+def fft_convolve(first, second):
+    """Konvolucija dviju razdioba vjerojatnosti (FFT za dulje nizove)."""
+    if min(len(first), len(second)) <= _DIRECT_CONVOLUTION:
+        return np.convolve(first, second)
+    length = len(first) + len(second) - 1
+    size = 1 << (length - 1).bit_length()
+    spectrum = np.fft.rfft(first, size) * np.fft.rfft(second, size)
+    result = np.fft.irfft(spectrum, size)[:length]
+    # Numerički šum FFT-a može dati male negativne vrijednosti
+    np.clip(result, 0.0, None, out=result)
+    return result / result.sum()
+
+
+def discretize(low, mode, high, step):
+    """Diskretizira trokutastu razdiobu na mreži s korakom 'step'.
+
+    Ćelija j pokriva [(start + j)·step, (start + j + 1)·step) i nosi njenu
+    vjerojatnost, a vrijednost joj je središte ćelije. Vraća (pmf, offset),
+    gdje je offset = start + 0.5 položaj središta prve ćelije u koracima.
+    """
+    if high <= low:
+        # Fiksno trajanje: sva masa u jednoj točki
+        return np.ones(1), low / step
+    start = int(np.floor(low / step))
+    cells = max(int(np.ceil(high / step)) - start, 1)
+    edges = (start + np.arange(cells + 1)) * step
+    pmf = np.diff(monte_carlo.triangular_cdf(edges, low, mode, high))
+    return pmf / pmf.sum(), start + 0.5
+
+
+class Distribution:
+    """Diskretna razdioba ukupnog trajanja na mreži s korakom 'step'.
+
+    Vrijednost indeksa j je (offset + j)·step.
+    """
+
+    def __init__(self, pmf, offset, step):
+        self.pmf = pmf
+        self.offset = offset
+        self.step = step
+
+    @property
+    def values(self):
+        return (self.offset + np.arange(len(self.pmf))) * self.step
+
+    def mean(self):
+        return float(self.pmf @ self.values)
+
+    def variance(self):
+        return float(self.pmf @ (self.values - self.mean()) ** 2)
+
+    def quantile(self, alpha):
+        """Najmanja vrijednost čija je kumulativna vjerojatnost barem alpha."""
+        cdf = np.cumsum(self.pmf)
+        index = min(int(np.searchsorted(cdf, alpha - 1e-12)), len(cdf) - 1)
+        return float(self.values[index])
+
+    def cvar(self, alpha):
+        """Očekivanje gornjeg repa mase 1 - alpha (CVaR na razini alpha)."""
+        values = self.values
+        if alpha >= 1.0:
+            return float(values[np.flatnonzero(self.pmf)[-1]])
+        cdf = np.cumsum(self.pmf)
+        index = min(int(np.searchsorted(cdf, alpha - 1e-12)), len(cdf) - 1)
+        # Ćelija na granici repa ulazi samo s dijelom mase iznad alpha
+        tail = values[index] * (cdf[index] - alpha)
+        tail += self.pmf[index + 1 :] @ values[index + 1 :]
+        return float(tail / (1.0 - alpha))
+
+    def exceedance_probability(self, deadline):
+        return float(self.pmf[self.values > deadline].sum())
+
+    def risk_measure(self, objective, alpha=0.9, deadline=None):
+        """Isti ciljevi kao monte_carlo.risk_measure, bez šuma uzorkovanja."""
+        if objective == "mean":
+            return self.mean()
+        if objective == "quantile":
+            return self.quantile(alpha)
+        if objective == "cvar":
+            return self.cvar(alpha)
+        if objective == "deadline":
+            if deadline is None:
+                raise ValueError("Cilj 'deadline' zahtijeva zadani rok (DEADLINE).")
+            return self.exceedance_probability(deadline)
+        raise ValueError(f"Nepoznat cilj trajanja: {objective!r}")
+
+
+class ConvolutionTree:
+    """Stablo djelomičnih konvolucija za dodavanje i uklanjanje aktivnosti.
+
+    Listovi su razdiobe aktivnosti (ili jedinična razdioba za neodabrane), a
+    svaki unutarnji čvor sprema konvoluciju svoje djece. Promjena jedne
+    aktivnosti ponovno računa samo O(log N) čvorova na putu do korijena, i to
+    tek kad se zatraži razdioba.
+    """
+
+    _IDENTITY = (np.ones(1), 0.0)
+
+    def __init__(self, engine, individual=None):
+        self.engine = engine
+        self.size = 1 << max(len(engine.pmfs) - 1, 0).bit_length()
+        self.selected = np.zeros(len(engine.pmfs), dtype=bool)
+        self.nodes = [self._IDENTITY] * (2 * self.size)
+        # Roditelji listova promijenjenih od zadnjeg distribution()
+        self.dirty = set()
+        if individual is not None:
+            self.selected[:] = np.asarray(individual, dtype=bool)
+            for i in np.flatnonzero(self.selected):
+                self.nodes[self.size + i] = (engine.pmfs[i], engine.offsets[i])
+            for node in range(self.size - 1, 0, -1):
+                self._combine(node)
+
+    def _combine(self, node):
+        (left, left_offset), (right, right_offset) = (
+            self.nodes[2 * node],
+            self.nodes[2 * node + 1],
+        )
+        # Neodabrana podstabla (jedinična razdioba) ne traže konvoluciju
+        if len(left) == 1:
+            self.nodes[node] = (right, left_offset + right_offset)
+        elif len(right) == 1:
+            self.nodes[node] = (left, left_offset + right_offset)
+        else:
+            self.nodes[node] = (fft_convolve(left, right), left_offset + right_offset)
+
+    def add(self, index):
+        self.update([index], [True])
+
+    def remove(self, index):
+        self.update([index], [False])
+
+    def update(self, indices, selected):
+        """Postavlja odabir aktivnosti 'indices' (lijeno, bez konvolucija).
+
+        Pretci promijenjenih listova obnavljaju se tek u distribution(), pa
+        se više uzastopnih promjena (mutacija nakon križanja) i čvor na kojem
+        se njihovi putevi spajaju računaju samo jednom.
+        """
+        for index, value in zip(indices, selected):
+            if self.selected[index] == value:
+                continue
+            self.selected[index] = value
+            leaf = self.size + index
+            self.nodes[leaf] = (
+                (self.engine.pmfs[index], self.engine.offsets[index])
+                if value
+                else self._IDENTITY
+            )
+            self.dirty.add(leaf // 2)
+
+    def _refresh(self):
+        """Obnavlja čvorove nad promijenjenim listovima, razinu po razinu."""
+        changed, self.dirty = self.dirty, set()
+        while changed:
+            # Svi čvorovi u 'changed' su na istoj razini
+            for node in changed:
+                self._combine(node)
+            changed = {node // 2 for node in changed if node > 1}
+
+    def copy(self):
+        """Kopija stabla; nizovi čvorova se dijele jer se nikad ne mijenjaju na mjestu."""
+        clone = ConvolutionTree.__new__(ConvolutionTree)
+        clone.engine = self.engine
+        clone.size = self.size
+        clone.selected = self.selected.copy()
+        clone.nodes = list(self.nodes)
+        clone.dirty = set(self.dirty)
+        return clone
+
+    def distribution(self):
+        self._refresh()
+        pmf, offset = self.nodes[1]
+        return Distribution(pmf, offset, self.engine.step)
+
+
+class DistributionEngine:
+    """Razdiobe ukupnog trajanja za podskupove aktivnosti jedne instance.
+
+    Točnost ovisi samo o koraku mreže 'step' (umjesto o NUM_SIMULATIONS), a
+    rezultati su deterministički.
+    """
+
+    def __init__(self, activities, step=DEFAULT_GRID_STEP):
+        self.step = step
+        self.pmfs, self.offsets = [], []
+        for low, mode, high in zip(*monte_carlo.activity_parameters(activities)):
+            pmf, offset = discretize(low, mode, high, step)
+            self.pmfs.append(pmf)
+            self.offsets.append(offset)
+
+    def distribution(self, individual):
+        """Razdioba zbroja odabranih aktivnosti (uravnotežene parne konvolucije)."""
+        selected = np.flatnonzero(np.asarray(individual, dtype=bool))
+        if len(selected) == 0:
+            return Distribution(np.ones(1), 0.0, self.step)
+        level = [self.pmfs[i] for i in selected]
+        while len(level) > 1:
+            pairs = [fft_convolve(a, b) for a, b in zip(level[::2], level[1::2])]
+            level = pairs + level[len(pairs) * 2 :]
+        offset = float(sum(self.offsets[i] for i in selected))
+        return Distribution(level[0], offset, self.step)
+
+    def tree(self, individual=None):
+        """Stablo za inkrementalno dodavanje/uklanjanje aktivnosti."""
+        return ConvolutionTree(self, individual)
@@ -0,0 +1,215 @@
+"""Vektorizirana evaluacija populacije - zajednički modul - diplomski rad - Neven Nižić"""
+
+import numpy as np
+
+import aktivnosti
+import monte_carlo
+
+# Kazna za neizvedive jedinke u više-objektivnom slučaju (kao u multi_objective_fitness)
+INFEASIBLE_MULTI = (0, 99999)
+
+
+def metric_arrays(activities):
+    """Vraća troškove i ROI aktivnosti kao NumPy nizove."""
+    if isinstance(activities, aktivnosti.ActivitySet):
+        return activities.cost, activities.roi
+    cost = np.array([act["cost"] for act in activities], dtype=float)
+    roi = np.array([act["roi"] for act in activities], dtype=float)
+    return cost, roi
+
+
+def duration_settings(config):
+    """(cilj, razina alpha, rok) drugog cilja iz CONFIG-a."""
+    return (
+        config.get("DURATION_OBJECTIVE", "mean"),
+        config.get("DURATION_ALPHA", 0.9),
+        config.get("DEADLINE"),
+    )
+
+
+def duration_measure(totals, config):
+    """Cilj trajanja iz CONFIG-a (DURATION_OBJECTIVE) nad simulacijama 'totals'."""
+    return monte_carlo.risk_measure(totals, *duration_settings(config))
+
+
+def distribution_measure(genome, config):
+    """Cilj trajanja iz egzaktne razdiobe (config["DISTRIBUTION"], konvolucija)."""
+    distribution = config["DISTRIBUTION"].distribution(genome)
+    return distribution.risk_measure(*duration_settings(config))
+
+
+def check_evaluation_options(config):
+    """Javlja ValueError za opcije evaluacije koje se međusobno isključuju.
+
+    DELTA_EVALUATION, EVALUATION_WORKERS > 1 i BATCH_EVALUATION zamjenjuju
+    evaluaciju po jedinki, pa smije biti uključena najviše jedna, a ADAPTIVE_MC
+    i FITNESS_CACHE_SIZE postoje samo u evaluaciji po jedinki. ADAPTIVE_MC ne
+    vrijedi ni uz COMMON_RANDOM_NUMBERS, koji uvijek koristi istu matricu uzoraka.
+    """
+    if config.get("ADAPTIVE_MC") and config.get("COMMON_RANDOM_NUMBERS"):
+        raise ValueError("ADAPTIVE_MC ne radi uz COMMON_RANDOM_NUMBERS.")
+    evaluators = [
+        name
+        for name, enabled in (
+            ("DELTA_EVALUATION", config.get("DELTA_EVALUATION")),
+            ("EVALUATION_WORKERS", config.get("EVALUATION_WORKERS", 0) > 1),
+            ("BATCH_EVALUATION", config.get("BATCH_EVALUATION")),
+        )
+        if enabled
+    ]
+    if len(evaluators) > 1:
+        raise ValueError(f"Uključeno je više načina evaluacije: {evaluators}.")
+    if not evaluators:
+        return
+    for option in ("ADAPTIVE_MC", "FITNESS_CACHE_SIZE"):
+        if config.get(option):
+            raise ValueError(
+                f"{option} radi samo uz evaluaciju po jedinki, ne uz {evaluators[0]}."
+            )
+
+
+def duration_label(config):
+    """Naziv stupca za cilj trajanja u izvozu Paretovog fronta."""
+    objective = config.get("DURATION_OBJECTIVE", "mean")
+    level = round(100 * config.get("DURATION_ALPHA", 0.9))
+    return {
+        "mean": "Trajanje",
+        "quantile": f"Trajanje_P{level}",
+        "cvar": f"Trajanje_CVaR{level}",
+        "deadline": "P_prekoracenja_roka",
+    }[objective]
+
+
+def pack_population(individuals):
+    """Pakira listu jedinki u uint8 matricu (jedinke × aktivnosti)."""
+    return np.array(individuals, dtype=np.uint8)
+
+
+class BatchEvaluator:
+    """Evaluira cijelu generaciju jednim vektoriziranim pozivom.
+
+    Registrira se u DEAP toolbox kao 'evaluate' i 'map': DEAP algoritmi pozivaju
+    toolbox.map(toolbox.evaluate, invalid_ind), pa se sve neevaluirane jedinke
+    generacije pakiraju u matricu i evaluiraju umnošcima s nizovima cost/roi.
+    """
+
+    def __init__(self, activities, config, multi_objective=False, rng=None):
+        self.activities = activities
+        self.config = config
+        self.multi_objective = multi_objective
+        self.rng = rng
+        self.cost, self.roi = metric_arrays(activities)
+        self.duration_params = monte_carlo.activity_parameters(activities)
+
+    @classmethod
+    def from_arrays(
+        cls, cost, roi, duration_params, config, multi_objective=False, rng=None
+    ):
+        """Evaluator nad gotovim nizovima aktivnosti (bez liste rječnika)."""
+        evaluator = cls.__new__(cls)
+        evaluator.activities = None
+        evaluator.config = config
+        evaluator.multi_objective = multi_objective
+        evaluator.rng = rng
+        evaluator.cost, evaluator.roi = cost, roi
+        evaluator.duration_params = duration_params
+        return evaluator
+
+    def __call__(self, individual):
+        """Evaluacija jedne jedinke (za pozive izvan toolbox.map)."""
+        return self.evaluate_matrix(pack_population([individual]))[0]
+
+    def map(self, func, individuals):
+        """Zamjena za ugrađeni map; evaluaciju radi za cijelu listu odjednom."""
+        # toolbox.register omata funkciju u functools.partial
+        if getattr(func, "func", func) is not self:
+            return map(func, individuals)
+        individuals = list(individuals)
+        if not individuals:
+            return []
+        return self.evaluate_matrix(pack_population(individuals))
+
+    def mean_durations(self, genomes):
+        """Prosječno Monte Carlo trajanje za svaki redak matrice jedinki.
+
+        Analitički model (ANALYTIC) i zajednička matrica uzoraka (CRN) imaju
+        fiksan doprinos po aktivnosti; bez njih se cijela generacija evaluira
+        nad jednim svježim blokom uzoraka. Kritični put (SCHEDULE) nije zbroj
+        po aktivnostima, pa se prosjek računa iz trajanja po simulacijama.
+        """
+        if self.config.get("SCHEDULE") is not None:
+            return self.population_totals(genomes, self.generation_samples()).mean(
+                axis=1
+            )
+        model = self.config.get("ANALYTIC")
+        if model is None:
+            model = self.config.get("CRN")
+        if model is not None:
+            return genomes @ model.column_means
+        return genomes @ self.generation_samples().mean(axis=0)
+
+    def generation_samples(self):
+        """Blok uzoraka za generaciju: matrica CRN ili svježi blok."""
+        crn = self.config.get("CRN")
+        if crn is not None:
+            return crn.samples
+        return monte_carlo.sample_durations(
+            *self.duration_params,
+            self.config["NUM_SIMULATIONS"],
+            self.rng,
+            self.config.get("CORRELATION"),
+        )
+
+    def population_totals(self, genomes, samples):
+        """Trajanje projekta (jedinke × simulacije) nad blokom uzoraka."""
+        schedule = self.config.get("SCHEDULE")
+        if schedule is None:
+            return genomes @ samples.T
+        totals = np.empty((len(genomes), len(samples)))
+        for row, genome in enumerate(genomes):
+            columns = np.flatnonzero(genome)
+            totals[row] = schedule.makespans(samples[:, columns], columns)
+        return totals
+
+    def duration_objectives(self, genomes):
+        """Cilj trajanja (DURATION_OBJECTIVE) za svaki redak matrice jedinki.
+
+        Rizične mjere računaju se iz jednog bloka simulacija za cijelu
+        generaciju: zajedničke matrice uzoraka (CRN) ili svježeg bloka.
+        Uz konvolucijski model (DISTRIBUTION) svaka jedinka ima egzaktnu razdiobu.
+        """
+        if self.config.get("DISTRIBUTION") is not None:
+            return np.array(
+                [distribution_measure(genome, self.config) for genome in genomes]
+            )
+        if self.config.get("DURATION_OBJECTIVE", "mean") == "mean":
+            return self.mean_durations(genomes)
+        totals = self.population_totals(genomes, self.generation_samples())
+        return duration_measure(totals, self.config)
+
+    def single_objective(self, genomes):
+        """Niz jedno-objektivnih vrijednosti: ROI ili kazna za prekoračenje budžeta."""
+        budget = self.config["BUDGET"]
+        total_cost = genomes @ self.cost
+        return np.where(
+            total_cost <= budget, genomes @ self.roi, -(total_cost - budget)
+        )
+
+    def evaluate_matrix(self, genomes):
+        """Vraća listu fitness tuplova za matricu jedinki."""
+        if not self.multi_objective:
+            return [(value,) for value in self.single_objective(genomes).tolist()]
+
+        total_cost = genomes @ self.cost
+        total_roi = genomes @ self.roi
+        feasible = total_cost <= self.config["BUDGET"]
+
+        durations = np.zeros(len(genomes))
+        if feasible.any():
+            durations[feasible] = self.duration_objectives(genomes[feasible])
+        return [
+            (roi, duration) if ok else INFEASIBLE_MULTI
+            for roi, duration, ok in zip(
+                total_roi.tolist(), durations.tolist(), feasible.tolist()
+            )
+        ]
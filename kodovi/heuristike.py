@@ -0,0 +1,138 @@
+"""Pohlepna inicijalizacija i popravak prema budžetu - diplomski rad - Neven Nižić"""
+
+from functools import wraps
+
+import numpy as np
+
+import aktivnosti
+import evaluacija
+
+# Raspon slučajnog množenja omjera ROI/trošak kod pohlepnog punjenja
+GREEDY_NOISE = 0.3
+
+# Broj kandidata slučajne pretrage koji se generiraju i evaluiraju odjednom
+RANDOM_SEARCH_BLOCK = 2048
+
+
+def cost_and_ratio(activities):
+    """Vraća (cost, ratio) za aktivnosti; ratio je omjer ROI/trošak (0 uz trošak 0).
+
+    Za ActivitySet koristi se već izračunati stupac 'ratio'.
+    """
+    if isinstance(activities, aktivnosti.ActivitySet):
+        return activities.cost, activities.ratio
+    cost, roi = evaluacija.metric_arrays(activities)
+    return cost, np.divide(roi, cost, out=np.zeros(len(cost)), where=cost > 0)
+
+
+def greedy_population(cost, ratio, budget, size, rng, noise=GREEDY_NOISE):
+    """Jedinke dobivene nasumičnim pohlepnim punjenjem po omjeru ROI/trošak.
+
+    Svaka jedinka omjere množi vlastitim šumom iz [1 - noise, 1 + noise],
+    sortira aktivnosti po tako dobivenom ključu i tim redom uzima svaku
+    aktivnost koja još stane u preostali budžet. Aktivnosti bez troška
+    (omjer 0) uvijek su na početku.
+    Vraća bool matricu (size × broj aktivnosti).
+    """
+    keys = ratio * rng.uniform(1 - noise, 1 + noise, size=(size, len(ratio)))
+    return _fill_by_keys(np.where(cost > 0, keys, np.inf), cost, budget)
+
+
+def random_feasible_population(cost, budget, size, rng):
+    """Izvedive jedinke: u slučajnom poretku uzima se svaka aktivnost koja još
+    stane u budžet, pa nijedna neodabrana aktivnost ne stane u ostatak."""
+    return _fill_by_keys(rng.random((size, len(cost))), cost, budget)
+
+
+def _fill_by_keys(keys, cost, budget):
+    """Za svaki redak prolazi aktivnosti po padajućem ključu i uzima svaku koja
+    stane u preostali budžet; one koje ne stanu preskače.
+
+    Petlja ide po aktivnostima, a svi retci obrađuju se odjednom.
+    """
+    order = np.argsort(-keys, axis=1)
+    rows = np.arange(len(keys))
+    remaining = np.full(len(keys), float(budget))
+    population = np.zeros(keys.shape, dtype=bool)
+    for column in order.T:
+        fits = cost[column] <= remaining
+        population[rows, column] = fits
+        remaining -= np.where(fits, cost[column], 0.0)
+    return population
+
+
+def random_search(
+    cost, roi, budget, num_evaluations, rng, sampler="uniform", block=None
+):
+    """Vektorizirana slučajna pretraga s num_evaluations kandidata.
+
+    Kandidati se generiraju u blokovima kao bool matrice: "uniform" uključuje
+    svaku aktivnost s vjerojatnošću 0.5, a "feasible" puni budžet aktivnostima
+    u slučajnom poretku (bez neizvedivih kandidata). Trošak i ROI bloka su
+    umnošci matrice i vektora. Vraća (najbolja jedinka, ROI) ili (None, 0) ako
+    nijedan kandidat nije izvediv; kod jednakog ROI-a zadržava se raniji.
+    """
+    block = RANDOM_SEARCH_BLOCK if block is None else block
+    best_ind, best_roi = None, 0.0
+    remaining = num_evaluations
+    while remaining > 0:
+        size = min(block, remaining)
+        remaining -= size
+        if sampler == "feasible":
+            genomes = random_feasible_population(cost, budget, size, rng)
+        else:
+            genomes = rng.random((size, len(cost))) < 0.5
+        values = np.where(genomes @ cost <= budget, genomes @ roi, -np.inf)
+        best = int(np.argmax(values))
+        if values[best] > -np.inf and (best_ind is None or values[best] > best_roi):
+            best_ind, best_roi = genomes[best].copy(), float(values[best])
+    return best_ind, best_roi
+
+
+def repair_population(population, cost, ratio, budget):
+    """Popravak: iz jedinki iznad budžeta izbacuje aktivnosti najlošijeg omjera.
+
+    Aktivnosti se izbacuju redom od najmanjeg omjera ROI/trošak dok trošak ne
+    padne na budžet; aktivnosti bez troška su na kraju reda pa se nikad ne
+    izbacuju. Radi nad bool matricom u mjestu i vraća masku popravljenih redaka.
+    """
+    excess = population @ cost - budget
+    over = excess > 0
+    if not over.any():
+        return over
+    order = np.lexsort((ratio, cost == 0))
+    selected = population[over][:, order]
+    removed_cost = np.cumsum(selected * cost[order], axis=1)
+    # Aktivnost se izbacuje ako prije nje izbačeni trošak još ne pokriva višak
+    drop = selected & (removed_cost - cost[order] < excess[over, None])
+    rows = population[over]
+    rows[:, order] = selected & ~drop
+    population[over] = rows
+    return over
+
+
+def repair_individual(individual, cost, ratio, budget):
+    """Popravak jedne DEAP jedinke (liste 0/1) u mjestu."""
+    genome = np.array([individual], dtype=bool)
+    if repair_population(genome, cost, ratio, budget)[0]:
+        individual[:] = genome[0].astype(int).tolist()
+        # Spremljeni zbrojevi (inkrementalna evaluacija) više ne vrijede
+        if getattr(individual, "aggregates", None) is not None:
+            individual.aggregates = None
+    return individual
+
+
+def repair_decorator(cost, ratio, budget):
+    """Dekorator za toolbox.decorate("mate"/"mutate", ...) koji popravlja potomke."""
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            offspring = func(*args, **kwargs)
+            for child in offspring:
+                repair_individual(child, cost, ratio, budget)
+            return offspring
+
+        return wrapper
+
+    return decorator
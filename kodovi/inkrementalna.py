@@ -0,0 +1,172 @@
+"""Inkrementalna (delta) evaluacija jedinki - zajednički modul - diplomski rad - Neven Nižić"""
+
+import random
+
+import numpy as np
+
+import evaluacija
+import monte_carlo
+
+
+class Aggregates:
+    """Spremljeni zbrojevi odabranih aktivnosti jedne jedinke.
+
+    'durations' je vektor ukupnih trajanja po simulaciji nad zajedničkom
+    matricom uzoraka (CRN) ili None kad CRN nije uključen, 'mean_duration'
+    analitičko očekivano trajanje ili None bez analitičkog modela, a 'tree'
+    stablo konvolucija (distribucija.ConvolutionTree) uz konvolucijski model.
+    """
+
+    __slots__ = ("cost", "roi", "durations", "mean_duration", "tree")
+
+    def __init__(self, cost, roi, durations=None, mean_duration=None, tree=None):
+        self.cost = cost
+        self.roi = roi
+        self.durations = durations
+        self.mean_duration = mean_duration
+        self.tree = tree
+
+    def __deepcopy__(self, memo):
+        durations = None if self.durations is None else self.durations.copy()
+        tree = None if self.tree is None else self.tree.copy()
+        return Aggregates(self.cost, self.roi, durations, self.mean_duration, tree)
+
+
+class DeltaEvaluator:
+    """Evaluacija koja nakon mutacije i križanja ažurira samo promijenjene gene.
+
+    Jedinka nosi atribut 'aggregates' (ukupni trošak, ROI i, uz CRN, vektor
+    trajanja po simulaciji). Operatori mate/mutate ovog razreda mijenjaju gene
+    i zbrojeve zajedno, pa evaluacija umjesto O(N·S) košta O(promjena·S).
+    Uz konvolucijski model (DISTRIBUTION) više-objektivna jedinka nosi i
+    stablo konvolucija, pa promjena gena obnavlja samo put od lista do
+    korijena umjesto cijele razdiobe. Registrira se u DEAP toolbox kao
+    'evaluate', 'mate' i 'mutate'. Operatori izvlače slučajne brojeve iz
+    modula random istim redom kao tools.mutFlipBit i tools.cxTwoPoint, pa uz
+    isto sjeme evolucija prolazi istom putanjom kao bez delta evaluacije.
+    """
+
+    def __init__(self, activities, config, multi_objective=False, rng=None):
+        self.activities = activities
+        self.config = config
+        self.multi_objective = multi_objective
+        self.rng = monte_carlo.get_rng() if rng is None else rng
+        self.cost, self.roi = evaluacija.metric_arrays(activities)
+        self.crn = self.samples = self.means = self.engine = None
+        # Jedno-objektivni fitness ne koristi trajanje, pa jedinke nose samo
+        # trošak i ROI
+        if not multi_objective:
+            return
+        self.crn = config.get("CRN")
+        # Kritični put nije zbroj po aktivnostima, pa se vektor trajanja ne ažurira
+        if self.crn is not None and config.get("SCHEDULE") is None:
+            self.samples = self.crn.samples
+        analytic = config.get("ANALYTIC")
+        if analytic is not None:
+            self.means = analytic.column_means
+        self.engine = config.get("DISTRIBUTION")
+
+    def aggregates(self, individual):
+        """Zbrojevi jedinke; računaju se ispočetka samo ako nisu spremljeni."""
+        cached = getattr(individual, "aggregates", None)
+        if cached is None:
+            selected = np.flatnonzero(np.asarray(individual, dtype=bool))
+            durations = mean_duration = tree = None
+            if self.samples is not None:
+                durations = self.samples[:, selected].sum(axis=1)
+            if self.means is not None:
+                mean_duration = float(self.means[selected].sum())
+            if self.engine is not None:
+                tree = self.engine.tree(individual)
+            cached = Aggregates(
+                float(self.cost[selected].sum()),
+                float(self.roi[selected].sum()),
+                durations,
+                mean_duration,
+                tree,
+            )
+            individual.aggregates = cached
+        return cached
+
+    def apply_flips(self, individual, indices):
+        """Ažurira zbrojeve za gene 'indices' koji su već promijenjeni u jedinki."""
+        if len(indices) == 0:
+            return
+        cached = getattr(individual, "aggregates", None)
+        if cached is None:
+            return
+        # +1 za aktivnost koja je dodana, -1 za uklonjenu
+        sign = np.array([1.0 if individual[i] else -1.0 for i in indices])
+        cached.cost += float(sign @ self.cost[indices])
+        cached.roi += float(sign @ self.roi[indices])
+        if cached.durations is not None:
+            cached.durations += self.samples[:, indices] @ sign
+        if cached.mean_duration is not None:
+            cached.mean_duration += float(sign @ self.means[indices])
+        if cached.tree is not None:
+            cached.tree.update(indices, sign > 0)
+
+    def mutate(self, individual, indpb):
+        """Bit-flip mutacija (kao tools.mutFlipBit) s ažuriranjem zbrojeva."""
+        flipped = [i for i in range(len(individual)) if random.random() < indpb]
+        for i in flipped:
+            individual[i] = type(individual[i])(not individual[i])
+        self.apply_flips(individual, np.array(flipped, dtype=int))
+        return (individual,)
+
+    def mate(self, ind1, ind2):
+        """Križanje u dvije točke (kao tools.cxTwoPoint) s ažuriranjem zbrojeva."""
+        size = min(len(ind1), len(ind2))
+        cxpoint1 = random.randint(1, size)
+        cxpoint2 = random.randint(1, size - 1)
+        if cxpoint2 >= cxpoint1:
+            cxpoint2 += 1
+        else:
+            cxpoint1, cxpoint2 = cxpoint2, cxpoint1
+
+        # Zamjena mijenja samo gene u kojima se roditelji razlikuju
+        differing = [i for i in range(cxpoint1, cxpoint2) if ind1[i] != ind2[i]]
+        for i in differing:
+            ind1[i], ind2[i] = ind2[i], ind1[i]
+        differing = np.array(differing, dtype=int)
+        self.apply_flips(ind1, differing)
+        self.apply_flips(ind2, differing)
+        return ind1, ind2
+
+    def __call__(self, individual):
+        """Fitness iz spremljenih zbrojeva (isti oblik kao *_objective_fitness)."""
+        cached = self.aggregates(individual)
+        budget = self.config["BUDGET"]
+        if not self.multi_objective:
+            if cached.cost > budget:
+                return (-(cached.cost - budget),)
+            return (cached.roi,)
+
+        if cached.cost > budget:
+            return evaluacija.INFEASIBLE_MULTI
+        if cached.tree is not None:
+            distribution = cached.tree.distribution()
+            measure = distribution.risk_measure(
+                *evaluacija.duration_settings(self.config)
+            )
+            return cached.roi, measure
+        if self.config.get("DISTRIBUTION") is not None:
+            return cached.roi, evaluacija.distribution_measure(individual, self.config)
+        if self.config.get("DURATION_OBJECTIVE", "mean") == "mean":
+            if cached.mean_duration is not None:
+                return cached.roi, cached.mean_duration
+            if cached.durations is not None:
+                return cached.roi, float(cached.durations.mean())
+        totals = cached.durations
+        if totals is None and self.crn is not None:
+            totals = self.crn.simulated_totals(individual)
+        elif totals is None:
+            totals = monte_carlo.simulated_totals(
+                individual,
+                self.activities,
+                self.config["NUM_SIMULATIONS"],
+                self.rng,
+                self.config.get("CORRELATION"),
+                self.config.get("SCHEDULE"),
+            )
+        return cached.roi, float(evaluacija.duration_measure(totals, self.config))
@@ -0,0 +1,155 @@
+"""Generator velikih sintetičkih instanci s predmemorijom na disku - zajednički modul - diplomski rad - Neven Nižić"""
+
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+
+import aktivnosti
+import korelacija
+
+# Zadani parametri; rasponi odgovaraju generate_data iz skripti eksperimenata
+DEFAULT_PARAMS = {
+    "cost_range": (50, 200),
+    # "uniform" (cijeli brojevi iz raspona) ili "lognormal" (medijan je
+    # geometrijska sredina raspona, rep odrezan na raspon)
+    "cost_distribution": "uniform",
+    "cost_sigma": 0.5,
+    "roi_range": (1.0, 3.0),
+    # Korelacija (Gaussova kopula) između troška i ROI-a, iz [-1, 1]
+    "cost_roi_correlation": 0.0,
+    "optimistic_range": (5, 10),
+    "realistic_range": (10, 20),
+    "pessimistic_range": (20, 40),
+    "max_predecessors": 3,
+}
+
+
+def resolve_params(params=None):
+    """Zadani parametri dopunjeni zadanima u 'params' (nepoznat ključ je greška)."""
+    params = dict(params or {})
+    unknown = set(params) - set(DEFAULT_PARAMS)
+    if unknown:
+        raise ValueError(f"Nepoznati parametri instance: {sorted(unknown)}")
+    return {**DEFAULT_PARAMS, **params}
+
+
+def _uniform_integers(u, low, high):
+    """Preslikava uniformne brojeve iz [0, 1) u cijele brojeve iz [low, high]."""
+    return np.minimum(low + np.floor(u * (high - low + 1)), high)
+
+
+def random_predecessors(size, max_predecessors, rng):
+    """Slučajni aciklički prethodnici u CSR obliku (pomaci, indeksi).
+
+    Aktivnost i dobiva do max_predecessors prethodnika među aktivnostima
+    0..i-1; ponovljeni izvučeni prethodnici se odbacuju.
+    """
+    counts = np.minimum(
+        rng.integers(0, max_predecessors + 1, size=size), np.arange(size)
+    )
+    rows = np.repeat(np.arange(size, dtype=np.int64), counts)
+    preds = np.floor(rng.random(len(rows)) * rows).astype(np.int64)
+    # Sortirani jedinstveni parovi (aktivnost, prethodnik)
+    rows, preds = np.divmod(np.unique(rows * size + preds), size)
+    offsets = np.zeros(size + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(np.bincount(rows, minlength=size))
+    return offsets, preds
+
+
+def generate(size, seed, params=None):
+    """Vektorizirano generira instancu od 'size' aktivnosti (ActivitySet).
+
+    'seed' je sjeme NumPy generatora (cijeli broj ili lista cijelih brojeva).
+    """
+    params = resolve_params(params)
+    rng = np.random.default_rng(seed)
+
+    rho = params["cost_roi_correlation"]
+    if not -1.0 <= rho <= 1.0:
+        raise ValueError("Korelacija troška i ROI-a mora biti iz [-1, 1].")
+    z_cost = rng.standard_normal(size)
+    z_roi = rho * z_cost + np.sqrt(1.0 - rho**2) * rng.standard_normal(size)
+
+    low, high = params["cost_range"]
+    if params["cost_distribution"] == "uniform":
+        cost = _uniform_integers(korelacija.normal_cdf(z_cost), low, high)
+    elif params["cost_distribution"] == "lognormal":
+        median = np.sqrt(low * high)
+        cost = np.clip(
+            np.round(median * np.exp(params["cost_sigma"] * z_cost)), low, high
+        )
+    else:
+        raise ValueError(f"Nepoznata razdioba troška: {params['cost_distribution']!r}")
+    low, high = params["roi_range"]
+    roi = np.round(low + korelacija.normal_cdf(z_roi) * (high - low), 2)
+
+    durations = [
+        rng.integers(bounds[0], bounds[1] + 1, size=size).astype(float)
+        for bounds in (
+            params["optimistic_range"],
+            params["realistic_range"],
+            params["pessimistic_range"],
+        )
+    ]
+    offsets, indices = random_predecessors(size, params["max_predecessors"], rng)
+    return aktivnosti.ActivitySet.from_columns(
+        {
+            "ids": np.arange(size, dtype=np.int64),
+            "cost": cost,
+            "roi": roi,
+            "optimistic": durations[0],
+            "realistic": durations[1],
+            "pessimistic": durations[2],
+            "predecessor_offsets": offsets,
+            "predecessor_indices": indices,
+        }
+    )
+
+
+def cache_path(cache_dir, size, seed, params, fmt="npy"):
+    """Putanja instance u predmemoriji, određena s (seed, size, params).
+
+    fmt="npy" je direktorij za memorijsko mapiranje, a fmt="npz" datoteka.
+    """
+    description = json.dumps(
+        {"size": size, "seed": seed, "params": resolve_params(params)}, sort_keys=True
+    )
+    key = hashlib.sha1(description.encode()).hexdigest()[:16]
+    name = f"instanca_n{size}_{key}"
+    return os.path.join(cache_dir, name + (".npz" if fmt == "npz" else ""))
+
+
+def save_atomic(activities, path):
+    """Sprema ActivitySet u privremenu putanju i zatim je preimenuje u 'path'.
+
+    Procesi koji istodobno spremaju istu instancu nikad ne čitaju napola
+    zapisane podatke; ako je drugi proces već spremio 'path', privremena
+    kopija se briše.
+    """
+    temp = f"{path}.{os.getpid()}.tmp" + (".npz" if path.endswith(".npz") else "")
+    activities.save(temp)
+    try:
+        os.replace(temp, path)
+    except OSError:
+        if os.path.isdir(temp):
+            shutil.rmtree(temp)
+        elif os.path.exists(temp):
+            os.remove(temp)
+
+
+def load_or_generate(size, seed, params=None, cache_dir=None, fmt="npy"):
+    """Instanca iz predmemorije na disku ili, ako je nema, generirana i spremljena.
+
+    Bez 'cache_dir' instanca se samo generira; spremanje ide preko
+    save_atomic, pa je sigurno i kad više procesa traži istu instancu.
+    """
+    if cache_dir is None:
+        return generate(size, seed, params)
+    path = cache_path(cache_dir, size, seed, params, fmt)
+    if not os.path.exists(path):
+        os.makedirs(cache_dir, exist_ok=True)
+        save_atomic(generate(size, seed, params), path)
+    return aktivnosti.ActivitySet.load(path)
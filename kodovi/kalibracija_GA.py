@@ -6,6 +6,10 @@ from deap import algorithms, base, creator, tools
 import numpy as np
 import pandas as pd
 
+import aktivnosti
+import monte_carlo
+import ucitavanje
+
 # ------------------------------
 # Postavke
 # ------------------------------
@@ -18,9 +22,14 @@ CX_PB = 0.7  # Vjerojatnost križanja
 MUT_PB = 0.2  # Vjerojatnost mutacije
 SEED = 42
 RUNS = 10  # Broj ponavljanja za svaku konfiguraciju
+# Stvarni portfelj (.csv, .parquet ili pretvorena instanca) umjesto sintetičkih
+# podataka; DATA_CACHE je direktorij pretvorenih tablica
+DATA_PATH = None
+DATA_CACHE = None
 
 random.seed(SEED)
 np.random.seed(SEED)
+monte_carlo.seed(SEED)
 
 
 # ------------------------------
@@ -28,7 +37,7 @@ np.random.seed(SEED)
 # ------------------------------
 def generate_data():
     """Generira slučajne aktivnosti sa cijenom, trajanjem i ROI."""
-    return [
+    rows = [
         {
             "id": i,
             "cost": random.randint(50, 200),
@@ -39,9 +48,14 @@ def generate_data():
         }
         for i in range(NUM_ACTIVITIES)
     ]
+    return aktivnosti.ActivitySet.from_dicts(rows)
 
 
-activities = generate_data()
+if DATA_PATH is not None:
+    activities = ucitavanje.load(DATA_PATH, cache_dir=DATA_CACHE)
+    NUM_ACTIVITIES = len(activities)
+else:
+    activities = generate_data()
 
 
 # ------------------------------
@@ -49,18 +63,9 @@ activities = generate_data()
 # ------------------------------
 def monte_carlo_eval_duration(individual):
     """Računa prosječno trajanje odabranih aktivnosti pomoću Monte Carlo simulacije."""
-    selected = [act for i, act in enumerate(activities) if individual[i] == 1]
-    if not selected:
-        return 0.0
-
-    durations = []
-    for _ in range(NUM_SIMULATIONS):
-        total = sum(
-            random.triangular(act["optimistic"], act["realistic"], act["pessimistic"])
-            for act in selected
-        )
-        durations.append(total)
-    return np.mean(durations)
+    return monte_carlo.monte_carlo_eval_duration(
+        individual, activities, NUM_SIMULATIONS
+    )
 
 
 # ------------------------------
@@ -68,9 +73,8 @@ def monte_carlo_eval_duration(individual):
 # ------------------------------
 def calculate_metrics(individual):
     """Vraća ukupni trošak i ROI."""
-    total_cost = sum(activities[i]["cost"] for i, sel in enumerate(individual) if sel)
-    total_roi = sum(activities[i]["roi"] for i, sel in enumerate(individual) if sel)
-    return total_cost, total_roi
+    mask = np.asarray(individual, dtype=bool)
+    return activities.cost[mask].sum(), activities.roi[mask].sum()
 
 
 def single_objective_fitness(individual):
@@ -9,6 +9,10 @@ from deap import algorithms, base, creator, tools
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+import aktivnosti
+import monte_carlo
+import ucitavanje
+
 # ==============================================================================
 # KONFIGURACIJA (za Eksperiment 1)
 # ==============================================================================
@@ -18,6 +22,10 @@ CONFIG = {
     "NUM_SIMULATIONS": 100,
     "SEED": 42,
     "RUNS": 10,  # Broj ponavljanja za svaku konfiguraciju
+    # Stvarni portfelj (.csv, .parquet ili pretvorena instanca) umjesto
+    # NUM_ACTIVITIES sintetičkih aktivnosti; DATA_CACHE je direktorij pretvorenih tablica
+    "DATA_PATH": None,
+    "DATA_CACHE": None,
 }
 
 # Inicijalni GA parametri (Standardni GA)
@@ -28,6 +36,7 @@ MUT_PB = 0.2
 
 random.seed(CONFIG["SEED"])
 np.random.seed(CONFIG["SEED"])
+monte_carlo.seed(CONFIG["SEED"])
 
 # ==============================================================================
 # DEAP STRUKTURE
@@ -41,7 +50,7 @@ creator.create("Individual", list, fitness=creator.FitnessMax)
 # ==============================================================================
 def generate_data(num_activities):
     """Generira slučajne aktivnosti."""
-    return [
+    rows = [
         {
             "id": i,
             "cost": random.randint(50, 200),
@@ -52,32 +61,27 @@ def generate_data(num_activities):
         }
         for i in range(num_activities)
     ]
+    return aktivnosti.ActivitySet.from_dicts(rows)
 
 
-activities = generate_data(CONFIG["NUM_ACTIVITIES"])
+if CONFIG["DATA_PATH"] is not None:
+    activities = ucitavanje.load(CONFIG["DATA_PATH"], cache_dir=CONFIG["DATA_CACHE"])
+    CONFIG["NUM_ACTIVITIES"] = len(activities)
+else:
+    activities = generate_data(CONFIG["NUM_ACTIVITIES"])
 
 
 def monte_carlo_eval_duration(individual):
     """Računa prosječno trajanje pomoću Monte Carlo simulacije."""
-    selected = [act for i, act in enumerate(activities) if individual[i] == 1]
-    if not selected:
-        return 0.0
-
-    durations = [
-        sum(
-            random.triangular(act["optimistic"], act["realistic"], act["pessimistic"])
-            for act in selected
-        )
-        for _ in range(CONFIG["NUM_SIMULATIONS"])
-    ]
-    return np.mean(durations)
+    return monte_carlo.monte_carlo_eval_duration(
+        individual, activities, CONFIG["NUM_SIMULATIONS"]
+    )
 
 
 def calculate_metrics(individual):
     """Vraća ukupni trošak i ROI."""
-    total_cost = sum(activities[i]["cost"] for i, sel in enumerate(individual) if sel)
-    total_roi = sum(activities[i]["roi"] for i, sel in enumerate(individual) if sel)
-    return total_cost, total_roi
+    mask = np.asarray(individual, dtype=bool)
+    return activities.cost[mask].sum(), activities.roi[mask].sum()
 
 
 def single_objective_fitness(individual):
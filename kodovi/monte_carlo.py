@@ -0,0 +1,329 @@
+"""Monte Carlo procjena trajanja - zajednički modul - diplomski rad - Neven Nižić"""
+
+import numpy as np
+
+import aktivnosti
+
+# ==============================================================================
+# GENERATOR SLUČAJNIH BROJEVA
+# ==============================================================================
+_rng = np.random.default_rng()
+
+# Broj uzorkovanih trajanja aktivnosti (za praćenje utroška simulacija)
+_draws = 0
+
+
+def seed(value):
+    """Postavlja sjeme zajedničkog NumPy generatora (zamjena za random.seed)."""
+    global _rng
+    _rng = np.random.default_rng(value)
+
+
+def get_rng():
+    """Vraća zajednički NumPy generator (za module koji ga dijele)."""
+    return _rng
+
+
+def draw_count():
+    """Broj uzorkovanih trajanja aktivnosti od zadnjeg reset_draw_count()."""
+    return _draws
+
+
+def reset_draw_count():
+    """Poništava brojač uzorkovanih trajanja."""
+    global _draws
+    _draws = 0
+
+
+def add_draws(count):
+    """Pribraja trajanja uzorkovana u drugom procesu (npr. na otoku GA)."""
+    global _draws
+    _draws += count
+
+
+# ==============================================================================
+# TROKUTASTA DISTRIBUCIJA
+# ==============================================================================
+def activity_parameters(activities):
+    """Vraća (optimistic, realistic, pessimistic) aktivnosti kao NumPy nizove."""
+    if isinstance(activities, aktivnosti.ActivitySet):
+        return activities.optimistic, activities.realistic, activities.pessimistic
+    low = np.array([act["optimistic"] for act in activities], dtype=float)
+    mode = np.array([act["realistic"] for act in activities], dtype=float)
+    high = np.array([act["pessimistic"] for act in activities], dtype=float)
+    return low, mode, high
+
+
+def triangular_inverse_cdf(u, low, mode, high):
+    """Inverzna funkcija distribucije trokutaste razdiobe (radi nad cijelim blokom).
+
+    'u' je matrica uniformnih brojeva (simulacije × aktivnosti), a 'low', 'mode'
+    i 'high' su nizovi parametara po aktivnostima koji se šire po retcima.
+    """
+    width = high - low
+    left = mode - low
+    right = high - mode
+    # Degenerirana aktivnost (low == high) ima fiksno trajanje
+    split = np.divide(left, width, out=np.full_like(width, 0.5), where=width > 0)
+    lower = low + np.sqrt(u * width * left)
+    upper = high - np.sqrt((1.0 - u) * width * right)
+    return np.where(u < split, lower, upper)
+
+
+def triangular_cdf(x, low, mode, high):
+    """Funkcija distribucije trokutaste razdiobe (parametri se šire kao i 'x').
+
+    Degenerirana aktivnost (low == high) ima skok s 0 na 1 u točki low.
+    """
+    width = high - low
+    left = np.maximum(x - low, 0.0)
+    right = np.maximum(high - x, 0.0)
+    rising = np.divide(
+        left**2,
+        width * (mode - low),
+        out=np.ones(np.broadcast(x, width).shape),
+        where=(width * (mode - low)) > 0,
+    )
+    falling = 1.0 - np.divide(
+        right**2,
+        width * (high - mode),
+        out=np.zeros(np.broadcast(x, width).shape),
+        where=(width * (high - mode)) > 0,
+    )
+    cdf = np.where(x <= mode, rising, falling)
+    return np.where(x <= low, (x >= high) * 1.0, np.where(x >= high, 1.0, cdf))
+
+
+def sample_durations(
+    low, mode, high, num_simulations, rng=None, correlation=None, columns=None
+):
+    """Uzorkuje blok trajanja oblika (num_simulations × broj aktivnosti).
+
+    Uz 'correlation' (korelacija.CorrelationModel) uniformni brojevi dolaze iz
+    Gaussove kopule; 'columns' su indeksi aktivnosti instance kojima pripadaju
+    parametri (zadano: sve aktivnosti).
+    """
+    global _draws
+    rng = _rng if rng is None else rng
+    if correlation is None:
+        u = rng.random((num_simulations, len(low)))
+    else:
+        u = correlation.uniforms(num_simulations, rng, columns)
+    _draws += u.size
+    return triangular_inverse_cdf(u, low, mode, high)
+
+
+# ==============================================================================
+# MONTE CARLO EVALUACIJA
+# ==============================================================================
+def monte_carlo_eval_duration(
+    individual, activities, num_simulations, rng=None, correlation=None
+):
+    """Računa prosječno trajanje pomoću vektorizirane Monte Carlo simulacije.
+
+    Uzorkuju se samo stupci odabranih aktivnosti, a ukupno trajanje svake
+    simulacije dobiva se zbrojem po retku (maskirani zbroj).
+    """
+    mask = np.asarray(individual, dtype=bool)
+    if not mask.any():
+        return 0.0
+    totals = simulated_totals(mask, activities, num_simulations, rng, correlation)
+    return float(totals.mean())
+
+
+def project_totals(samples, columns, schedule=None):
+    """Trajanje projekta po simulaciji iz trajanja aktivnosti 'columns'.
+
+    Bez rasporeda aktivnosti se izvode jedna za drugom (zbroj po retku), a uz
+    'schedule' (raspored.CriticalPath) trajanje je duljina kritičnog puta.
+    """
+    if schedule is None:
+        return samples.sum(axis=1)
+    return schedule.makespans(samples, columns)
+
+
+def simulated_totals(
+    individual,
+    activities,
+    num_simulations,
+    rng=None,
+    correlation=None,
+    schedule=None,
+):
+    """Ukupno trajanje jedinke u svakoj od num_simulations svježih simulacija."""
+    mask = np.asarray(individual, dtype=bool)
+    if not mask.any():
+        return np.zeros(num_simulations)
+    columns = np.flatnonzero(mask)
+    low, mode, high = (param[columns] for param in activity_parameters(activities))
+    samples = sample_durations(
+        low, mode, high, num_simulations, rng, correlation, columns
+    )
+    return project_totals(samples, columns, schedule)
+
+
+# Zadana veličina bloka simulacija kod adaptivnog uzorkovanja
+ADAPTIVE_BATCH = 25
+
+
+def adaptive_totals(
+    individual,
+    activities,
+    tolerance,
+    max_simulations,
+    batch_size=ADAPTIVE_BATCH,
+    rng=None,
+    correlation=None,
+    schedule=None,
+):
+    """Ukupna trajanja uzorkovana u blokovima do zadane preciznosti prosjeka.
+
+    Uzorkovanje staje kad relativna standardna pogreška prosjeka (SE / prosjek)
+    padne na 'tolerance' ili kad se dosegne 'max_simulations' simulacija.
+    """
+    mask = np.asarray(individual, dtype=bool)
+    if not mask.any():
+        return np.zeros(1)
+    columns = np.flatnonzero(mask)
+    low, mode, high = (param[columns] for param in activity_parameters(activities))
+
+    blocks, count, total, total_sq = [], 0, 0.0, 0.0
+    while count < max_simulations:
+        size = min(batch_size, max_simulations - count)
+        samples = sample_durations(low, mode, high, size, rng, correlation, columns)
+        block = project_totals(samples, columns, schedule)
+        blocks.append(block)
+        count += size
+        total += block.sum()
+        total_sq += block @ block
+        if count < 2:
+            continue
+        mean = total / count
+        variance = max(total_sq - count * mean**2, 0.0) / (count - 1)
+        if np.sqrt(variance / count) <= tolerance * abs(mean):
+            break
+    return np.concatenate(blocks)
+
+
+# ==============================================================================
+# ZAJEDNIČKI SLUČAJNI BROJEVI (COMMON RANDOM NUMBERS)
+# ==============================================================================
+class CommonRandomNumbers:
+    """Jedna matrica uzoraka trajanja (simulacije × aktivnosti) po instanci.
+
+    Sve jedinke evaluiraju se nad istim uzorcima, pa je trajanje jedinke samo
+    umnožak matrice i vektora odabira, a razlike među jedinkama nisu posljedica
+    šuma uzorkovanja. Uz 'schedule' trajanje je duljina kritičnog puta, pa
+    prosjeci stupaca (column_means) vrijede samo za serijsko izvođenje.
+    """
+
+    def __init__(
+        self, activities, num_simulations, rng=None, correlation=None, schedule=None
+    ):
+        low, mode, high = activity_parameters(activities)
+        self.samples = sample_durations(
+            low, mode, high, num_simulations, rng, correlation
+        )
+        self.column_means = self.samples.mean(axis=0)
+        self.schedule = schedule
+
+    def simulated_totals(self, individual):
+        """Vraća ukupno trajanje jedinke u svakoj od simulacija."""
+        if self.schedule is not None:
+            columns = np.flatnonzero(np.asarray(individual, dtype=bool))
+            return self.schedule.makespans(self.samples[:, columns], columns)
+        return self.samples @ np.asarray(individual, dtype=float)
+
+    def mean_duration(self, individual):
+        """Prosječno trajanje jedinke (jednako srednjoj vrijednosti simulacija)."""
+        if self.schedule is not None:
+            return float(self.simulated_totals(individual).mean())
+        return float(self.column_means @ np.asarray(individual, dtype=float))
+
+
+# ==============================================================================
+# ANALITIČKO OČEKIVANO TRAJANJE
+# ==============================================================================
+def triangular_mean(low, mode, high):
+    """Očekivanje trokutaste razdiobe: (a + m + b) / 3."""
+    return (low + mode + high) / 3.0
+
+
+def triangular_variance(low, mode, high):
+    """Varijanca trokutaste razdiobe: (a² + m² + b² - am - ab - mb) / 18."""
+    return (low**2 + mode**2 + high**2 - low * mode - low * high - mode * high) / 18.0
+
+
+class AnalyticDuration:
+    """Egzaktno očekivanje i varijanca zbroja nezavisnih trokutastih trajanja.
+
+    Očekivanje (i varijanca) zbroja jednaki su zbroju očekivanja (varijanci)
+    odabranih aktivnosti, pa prosjek trajanja ne zahtijeva uzorkovanje niti
+    sadrži šum. Sučelje prati CommonRandomNumbers (mean_duration).
+    """
+
+    def __init__(self, activities):
+        low, mode, high = activity_parameters(activities)
+        self.column_means = triangular_mean(low, mode, high)
+        self.column_variances = triangular_variance(low, mode, high)
+
+    def mean_duration(self, individual):
+        """Očekivano ukupno trajanje jedinke."""
+        return float(self.column_means @ np.asarray(individual, dtype=float))
+
+    def variance(self, individual):
+        """Varijanca ukupnog trajanja jedinke."""
+        return float(self.column_variances @ np.asarray(individual, dtype=float))
+
+
+# ==============================================================================
+# RIZIČNE MJERE TRAJANJA (IZ JEDNOG BLOKA SIMULACIJA)
+# ==============================================================================
+# Drugi cilj NSGA-II: prosjek, α-kvantil, CVaR na razini α ili vjerojatnost
+# prekoračenja roka
+DURATION_OBJECTIVES = ("mean", "quantile", "cvar", "deadline")
+
+
+def _tail_count(num_simulations, fraction):
+    """Broj simulacija u udjelu 'fraction', zaokružen prema gore (barem 1)."""
+    return max(1, int(np.ceil(fraction * num_simulations - 1e-9)))
+
+
+def quantile(totals, alpha):
+    """Empirijski α-kvantil po zadnjoj osi.
+
+    np.partition postavlja samo traženi element na njegovo mjesto u sortiranom
+    poretku (O(S) umjesto O(S log S)).
+    """
+    k = min(_tail_count(totals.shape[-1], alpha), totals.shape[-1]) - 1
+    return np.partition(totals, k, axis=-1)[..., k]
+
+
+def cvar(totals, alpha):
+    """CVaR: prosjek najduljih (1 - α) udjela simulacija po zadnjoj osi."""
+    num_simulations = totals.shape[-1]
+    start = num_simulations - _tail_count(num_simulations, 1.0 - alpha)
+    return np.partition(totals, start, axis=-1)[..., start:].mean(axis=-1)
+
+
+def exceedance_probability(totals, deadline):
+    """Udio simulacija u kojima ukupno trajanje prelazi rok."""
+    return (totals > deadline).mean(axis=-1)
+
+
+def risk_measure(totals, objective, alpha=0.9, deadline=None):
+    """Vrijednost cilja 'objective' (DURATION_OBJECTIVES) nad blokom simulacija.
+
+    'totals' je vektor trajanja po simulaciji ili matrica (jedinke × simulacije).
+    """
+    if objective == "mean":
+        return totals.mean(axis=-1)
+    if objective == "quantile":
+        return quantile(totals, alpha)
+    if objective == "cvar":
+        return cvar(totals, alpha)
+    if objective == "deadline":
+        if deadline is None:
+            raise ValueError("Cilj 'deadline' zahtijeva zadani rok (DEADLINE).")
+        return exceedance_probability(totals, deadline)
+    raise ValueError(f"Nepoznat cilj trajanja: {objective!r}")
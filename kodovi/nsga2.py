@@ -0,0 +1,109 @@
+"""Vektorizirana NSGA-II selekcija - zajednički modul - diplomski rad - Neven Nižić"""
+
+from bisect import bisect_left
+
+import numpy as np
+
+
+# ==============================================================================
+# NEDOMINIRANO SORTIRANJE
+# ==============================================================================
+def non_dominated_ranks(objectives):
+    """Vraća rang fronte (0 = Paretova fronta) za svaki redak matrice ciljeva.
+
+    Svi ciljevi se maksimiziraju (u DEAP-u to su fitness.wvalues). Za dva cilja
+    koristi se specijalizirani O(n log n) postupak, a inače opći postupak s
+    matricom dominacije.
+    """
+    objectives = np.asarray(objectives, dtype=float)
+    if objectives.shape[1] == 2:
+        return _ranks_two_objectives(objectives)
+    return _ranks_general(objectives)
+
+
+def _ranks_general(objectives):
+    """Brzo nedominirano sortiranje preko (n × n) matrice dominacije."""
+    geq = (objectives[:, None, :] >= objectives[None, :, :]).all(axis=2)
+    gt = (objectives[:, None, :] > objectives[None, :, :]).any(axis=2)
+    dominates = geq & gt  # dominates[i, j]: i dominira j
+    counts = dominates.sum(axis=0)
+    ranks = np.full(len(objectives), -1)
+    current = np.flatnonzero(counts == 0)
+    rank = 0
+    while len(current):
+        ranks[current] = rank
+        counts = counts - dominates[current].sum(axis=0)
+        counts[ranks >= 0] = -1
+        current = np.flatnonzero(counts == 0)
+        rank += 1
+    return ranks
+
+
+def _ranks_two_objectives(objectives):
+    """Nedominirano sortiranje za dva cilja u O(n log n).
+
+    Točke se obrađuju po padajućem prvom cilju; unutar fronte drugi cilj tada
+    raste, pa je za provjeru dominacije dovoljno usporediti točku sa zadnjim
+    članom fronte, a frontu se traži binarnim pretraživanjem.
+    """
+    order = np.lexsort((-objectives[:, 1], -objectives[:, 0]))
+    ranks = np.empty(len(objectives), dtype=int)
+    # Zadnji član svake fronte kao (-f2, -f1): ključevi rastu s indeksom fronte
+    tails = []
+    for idx in order:
+        f1, f2 = objectives[idx]
+        # Prva fronta čiji zadnji član ne dominira točku (ključ >= (-f2, -f1))
+        rank = bisect_left(tails, (-f2, -f1))
+        if rank == len(tails):
+            tails.append((-f2, -f1))
+        else:
+            tails[rank] = (-f2, -f1)
+        ranks[idx] = rank
+    return ranks
+
+
+# ==============================================================================
+# UDALJENOST NAGOMILAVANJA (CROWDING DISTANCE)
+# ==============================================================================
+def crowding_distance(objectives):
+    """Udaljenost nagomilavanja za točke jedne fronte (rubne točke = inf)."""
+    objectives = np.asarray(objectives, dtype=float)
+    n = len(objectives)
+    distance = np.zeros(n)
+    if n <= 2:
+        distance[:] = np.inf
+        return distance
+    for column in objectives.T:
+        order = np.argsort(column, kind="stable")
+        values = column[order]
+        span = values[-1] - values[0]
+        distance[order[0]] = distance[order[-1]] = np.inf
+        if span > 0:
+            distance[order[1:-1]] += (values[2:] - values[:-2]) / span
+    return distance
+
+
+# ==============================================================================
+# SELEKCIJA (zamjena za tools.selNSGA2)
+# ==============================================================================
+def select_indices(objectives, k):
+    """Vraća indekse k redaka odabranih NSGA-II kriterijem (rang, pa nagomilavanje)."""
+    objectives = np.asarray(objectives, dtype=float)
+    ranks = non_dominated_ranks(objectives)
+    chosen = []
+    for rank in range(ranks.max() + 1):
+        front = np.flatnonzero(ranks == rank)
+        if len(chosen) + len(front) <= k:
+            chosen.extend(front.tolist())
+            continue
+        distance = crowding_distance(objectives[front])
+        last = front[np.argsort(-distance, kind="stable")]
+        chosen.extend(last[: k - len(chosen)].tolist())
+        break
+    return chosen
+
+
+def sel_nsga2(individuals, k):
+    """NSGA-II selekcija nad DEAP jedinkama, s istim potpisom kao tools.selNSGA2."""
+    objectives = np.array([ind.fitness.wvalues for ind in individuals])
+    return [individuals[i] for i in select_indices(objectives, k)]
@@ -0,0 +1,144 @@
+"""NumPy genetski algoritam (alternativa DEAP eaSimple) - diplomski rad - Neven Nižić"""
+
+import numpy as np
+from deap import tools
+
+import evaluacija
+import heuristike
+import monte_carlo
+
+# Vjerojatnost promjene pojedinog gena kod mutacije (kao mutFlipBit indpb=0.1)
+INDPB = 0.1
+
+
+# ==============================================================================
+# GENETSKI OPERATORI NAD CIJELOM POPULACIJOM
+# ==============================================================================
+def select_tournament(fitness, k, tournsize, rng):
+    """Turnirska selekcija: vraća indekse k pobjednika turnira veličine tournsize."""
+    aspirants = rng.integers(0, len(fitness), size=(k, tournsize))
+    winners = np.argmax(fitness[aspirants], axis=1)
+    return aspirants[np.arange(k), winners]
+
+
+def cx_two_point(population, cxpb, rng):
+    """Križanje u dvije točke za parove (0,1), (2,3), ... s vjerojatnošću cxpb.
+
+    Vraća masku jedinki koje su se promijenile.
+    """
+    num_pairs = len(population) // 2
+    size = population.shape[1]
+    changed = np.zeros(len(population), dtype=bool)
+    mated = np.flatnonzero(rng.random(num_pairs) < cxpb)
+    if size < 2 or len(mated) == 0:
+        return changed
+
+    # Dvije različite točke reza iz 1..size, kao u tools.cxTwoPoint
+    first = rng.integers(1, size + 1, size=len(mated))
+    second = rng.integers(1, size, size=len(mated))
+    second = np.where(second >= first, second + 1, second)
+    low, high = np.minimum(first, second), np.maximum(first, second)
+    columns = np.arange(size)
+    segment = (columns >= low[:, None]) & (columns < high[:, None])
+
+    left, right = population[2 * mated], population[2 * mated + 1]
+    population[2 * mated] = np.where(segment, right, left)
+    population[2 * mated + 1] = np.where(segment, left, right)
+    changed[2 * mated] = True
+    changed[2 * mated + 1] = True
+    return changed
+
+
+def mut_flip_bit(population, mutpb, rng, indpb=INDPB):
+    """Bit-flip mutacija jedinki odabranih s vjerojatnošću mutpb.
+
+    Vraća masku jedinki koje su se promijenile.
+    """
+    mutated = rng.random(len(population)) < mutpb
+    flips = (rng.random(population.shape) < indpb) & mutated[:, None]
+    population ^= flips
+    return mutated
+
+
+# ==============================================================================
+# GLAVNA PETLJA (ekvivalent algorithms.eaSimple)
+# ==============================================================================
+def ea_simple(config, activities, tournsize=3, rng=None, controller=None):
+    """Jedno-objektivni GA nad populacijom (POP_SIZE × NUM_ACTIVITIES) u jednom nizu.
+
+    Koristi iste CONFIG ključeve kao run_ga_once (POP_SIZE, NGEN, CX_PB, MUT_PB).
+    Vraća najbolju pronađenu jedinku (bool niz) i logbook s istim stupcima
+    koje bilježi eaSimple uz statistiku (gen, nevals, avg, std, min, max).
+    Uz 'controller' (zaustavljanje.TerminationController) evolucija može stati
+    ranije, a logbook dobiva i stupac s proteklim vremenom te razlog zaustavljanja.
+    GREEDY_SEED_FRACTION i REPAIR (heuristike) rade kao u DEAP inačici.
+    """
+    rng = monte_carlo.get_rng() if rng is None else rng
+    evaluator = evaluacija.BatchEvaluator(activities, config)
+    pop_size = config["POP_SIZE"]
+    cost, ratio = heuristike.cost_and_ratio(activities)
+    repair = config.get("REPAIR", False)
+
+    population = rng.random((pop_size, len(activities))) < 0.5
+    num_greedy = int(round(config.get("GREEDY_SEED_FRACTION", 0.0) * pop_size))
+    population[:num_greedy] = heuristike.greedy_population(
+        cost, ratio, config["BUDGET"], num_greedy, rng
+    )
+    fitness = evaluator.single_objective(population)
+
+    logbook = tools.Logbook()
+    logbook.header = ["gen", "nevals", "avg", "std", "min", "max"]
+    if controller is not None:
+        logbook.header.insert(2, "time")
+        controller.start()
+
+    best = np.argmax(fitness)
+    best_ind, best_fitness = population[best].copy(), fitness[best]
+    _record(logbook, 0, pop_size, fitness, controller)
+    reason = _check(controller, 0, best_fitness)
+
+    gen = 0
+    while reason is None and gen < config["NGEN"]:
+        gen += 1
+        chosen = select_tournament(fitness, pop_size, tournsize, rng)
+        population, fitness = population[chosen], fitness[chosen]
+
+        changed = cx_two_point(population, config["CX_PB"], rng)
+        changed |= mut_flip_bit(population, config["MUT_PB"], rng)
+        if repair:
+            changed |= heuristike.repair_population(
+                population, cost, ratio, config["BUDGET"]
+            )
+        if changed.any():
+            fitness[changed] = evaluator.single_objective(population[changed])
+
+        best = np.argmax(fitness)
+        if fitness[best] > best_fitness:
+            best_ind, best_fitness = population[best].copy(), fitness[best]
+        _record(logbook, gen, int(changed.sum()), fitness, controller)
+        reason = _check(controller, gen, best_fitness)
+
+    if controller is not None:
+        controller.finish(logbook, gen, reason)
+    return best_ind, logbook
+
+
+def _check(controller, gen, best_fitness):
+    """Razlog ranog zaustavljanja ili None (i kad kontrolera nema)."""
+    if controller is None:
+        return None
+    return controller.check(gen, best_fitness, best_fitness)
+
+
+def _record(logbook, gen, nevals, fitness, controller=None):
+    """Bilježi statistiku generacije u logbook."""
+    extra = {} if controller is None else {"time": controller.elapsed()}
+    logbook.record(
+        gen=gen,
+        nevals=nevals,
+        **extra,
+        avg=np.mean(fitness),
+        std=np.std(fitness),
+        min=np.min(fitness),
+        max=np.max(fitness),
+    )
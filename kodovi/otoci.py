@@ -0,0 +1,236 @@
+"""Model otoka s migracijom (paralelni GA) - zajednički modul - diplomski rad - Neven Nižić"""
+
+import multiprocessing
+import random
+import traceback
+
+import numpy as np
+from deap import tools
+
+import monte_carlo
+import sjeme
+
+# Topologije migracije: prsten (otok i šalje otoku i + 1) ili potpuno povezana
+TOPOLOGIES = ("ring", "full")
+
+
+def migration_sources(index, num_islands, topology):
+    """Indeksi otoka od kojih otok 'index' prima migrante."""
+    if topology == "ring":
+        return [(index - 1) % num_islands] if num_islands > 1 else []
+    if topology == "full":
+        return [j for j in range(num_islands) if j != index]
+    raise ValueError(f"Nepoznata topologija migracije: {topology!r}")
+
+
+class Island:
+    """Jedna potpopulacija s vlastitim toolboxom, kućom slavnih i logbookom.
+
+    'setup(streams)' vraća (toolbox, populacija, statistika ili None), a
+    'algorithm' je DEAP petlja (eaSimple ili eaMuPlusLambda) s već zadanim
+    parametrima križanja i mutacije. Stanje globalnog modula random (kojeg
+    koriste DEAP operatori) čuva se po otoku, pa rezultat ne ovisi o tome
+    izvode li se otoci u istom procesu ili u zasebnim procesima.
+    """
+
+    def __init__(self, setup, algorithm, halloffame, streams):
+        sjeme.seed_global_random(streams)
+        self.toolbox, self.population, self.stats = setup(streams)
+        self.random_state = random.getstate()
+        self.algorithm = algorithm
+        self.halloffame = halloffame()
+        self.logbook = tools.Logbook()
+        self.generations = 0
+
+    def evolve(self, generations):
+        """Nastavlja evoluciju za 'generations' generacija."""
+        random.setstate(self.random_state)
+        self.population, logbook = self.algorithm(
+            self.population,
+            self.toolbox,
+            ngen=generations,
+            stats=self.stats,
+            halloffame=self.halloffame,
+            verbose=False,
+        )
+        self.random_state = random.getstate()
+        # Generacija 0 nastavka samo ponavlja zadnji zapis prethodne epohe
+        for record in logbook[1 if self.generations else 0 :]:
+            self.logbook.record(**dict(record, gen=self.generations + record["gen"]))
+        self.generations += generations
+
+    def epoch(self, generations, num_migrants):
+        """Evolucija jedne epohe; vraća kopije najboljih jedinki za migraciju."""
+        self.evolve(generations)
+        return [
+            self.toolbox.clone(ind)
+            for ind in tools.selBest(self.population, num_migrants)
+        ]
+
+    def receive(self, immigrants):
+        """Migranti zamjenjuju najlošije jedinke otoka."""
+        if not immigrants:
+            return
+        worst = tools.selWorst(self.population, len(immigrants))
+        positions = {id(ind): i for i, ind in enumerate(self.population)}
+        for ind, immigrant in zip(worst, immigrants):
+            self.population[positions[id(ind)]] = immigrant
+
+    def result(self):
+        """(kuća slavnih, logbook) otoka; gasi bazen evaluacije toolboxa ako ga ima."""
+        if hasattr(self.toolbox, "close"):
+            self.toolbox.close()
+        return self.halloffame, self.logbook
+
+
+class _LocalIsland:
+    """Otok u procesu koji ga poziva (isto sučelje kao _IslandProcess)."""
+
+    def __init__(self, args):
+        self.island = Island(*args)
+        self.reply = None
+
+    def send(self, method, *params):
+        self.reply = getattr(self.island, method)(*params)
+
+    def recv(self):
+        return self.reply
+
+    def finish(self):
+        return self.island.result()
+
+    def close(self):
+        pass
+
+
+def _serve(conn, args):
+    """Petlja procesa otoka: izvršava naredbe primljene kroz cijev.
+
+    Uz rezultat se vraća i broj trajanja uzorkovanih u procesu otoka.
+    """
+    try:
+        monte_carlo.reset_draw_count()
+        island = Island(*args)
+        while True:
+            method, params = conn.recv()
+            if method == "result":
+                conn.send((True, (island.result(), monte_carlo.draw_count())))
+                break
+            reply = getattr(island, method)(*params)
+            if method != "receive":
+                conn.send((True, reply))
+    except Exception:
+        conn.send((False, traceback.format_exc()))
+    finally:
+        conn.close()
+
+
+class _IslandProcess:
+    """Otok u zasebnom procesu; naredbe i migranti putuju kroz cijev."""
+
+    def __init__(self, args, context):
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=_serve, args=(child, args), daemon=True)
+        self.process.start()
+        child.close()
+
+    def send(self, method, *params):
+        self.conn.send((method, params))
+
+    def recv(self):
+        ok, reply = self.conn.recv()
+        if not ok:
+            raise RuntimeError(f"Greška u procesu otoka:\n{reply}")
+        return reply
+
+    def finish(self):
+        self.send("result")
+        result, draws = self.recv()
+        monte_carlo.add_draws(draws)
+        return result
+
+    def close(self):
+        self.conn.close()
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.terminate()
+
+
+def merge_logbooks(logbooks):
+    """Spaja logbookove otoka jednake veličine u jedan zapis po generaciji.
+
+    'nevals' se zbraja, 'min' i 'max' su ekstremi, 'std' je standardna
+    devijacija spojene populacije, a ostale vrijednosti prosjeci po otocima.
+    """
+    merged = tools.Logbook()
+    for records in zip(*logbooks):
+        record = {"gen": records[0]["gen"]}
+        for key in records[0]:
+            if key == "gen":
+                continue
+            values = np.array([r[key] for r in records], dtype=float)
+            if key == "nevals":
+                record[key] = int(values.sum())
+            elif key == "min":
+                record[key] = values.min()
+            elif key == "max":
+                record[key] = values.max()
+            elif key == "std":
+                means = np.array([r["avg"] for r in records], dtype=float)
+                second = (values**2 + means**2).mean()
+                record[key] = np.sqrt(max(second - means.mean() ** 2, 0.0))
+            else:
+                record[key] = values.mean()
+        merged.record(**record)
+    return merged
+
+
+def run_islands(
+    setup,
+    algorithm,
+    halloffame,
+    island_streams,
+    generations,
+    interval,
+    num_migrants,
+    topology="ring",
+    processes=True,
+):
+    """Evolucija modelom otoka; vraća (spojena kuća slavnih, spojeni logbook).
+
+    Svaki otok (jedan po elementu 'island_streams') evoluira 'interval'
+    generacija, nakon čega njegovih 'num_migrants' najboljih jedinki seli
+    susjedima prema topologiji. Uz processes=True otoci se izvode u zasebnim
+    procesima istodobno, a glavni proces samo prosljeđuje migrante kroz cijevi.
+    'halloffame' je konstruktor kuće slavnih (npr. tools.ParetoFront).
+    """
+    num_islands = len(island_streams)
+    args = [(setup, algorithm, halloffame, streams) for streams in island_streams]
+    if processes:
+        context = multiprocessing.get_context()
+        islands = [_IslandProcess(a, context) for a in args]
+    else:
+        islands = [_LocalIsland(a) for a in args]
+
+    try:
+        done = 0
+        while done < generations:
+            step = min(interval, generations - done)
+            for island in islands:
+                island.send("epoch", step, num_migrants)
+            emigrants = [island.recv() for island in islands]
+            done += step
+            if done >= generations:
+                break
+            for index, island in enumerate(islands):
+                sources = migration_sources(index, num_islands, topology)
+                island.send("receive", [ind for j in sources for ind in emigrants[j]])
+        results = [island.finish() for island in islands]
+    finally:
+        for island in islands:
+            island.close()
+
+    merged = halloffame()
+    for island_hof, _ in results:
+        merged.update(list(island_hof))
+    return merged, merge_logbooks([logbook for _, logbook in results])
@@ -0,0 +1,96 @@
+"""Jedinka s genima pakiranim u bitove - zajednički modul - diplomski rad - Neven Nižić"""
+
+import copy
+
+import numpy as np
+
+
+class PackedBits:
+    """Binarni genom s jednim bitom po genu (umjesto pokazivača po genu u listi).
+
+    Bitovi su u bytearray poretku np.packbits (najviši bit prvi), pa je
+    genom 8 gena po bajtu. Podržava sučelje liste koje koriste DEAP operatori:
+    len, indeksiranje i dodjelu pojedinog gena (tools.mutFlipBit) te isječke
+    (tools.cxTwoPoint, ind[:] = ...). np.asarray(jedinka) vraća uint8 niz
+    gena bez petlje u Pythonu. Osnovna je klasa za creator.create, npr.
+    creator.create("PackedIndividual", PackedBits, fitness=creator.FitnessMax).
+    """
+
+    def __init__(self, genes=()):
+        genes = np.fromiter(genes, dtype=bool) if not np.ndim(genes) else genes
+        genes = np.asarray(genes, dtype=bool)
+        self._size = len(genes)
+        self._bits = bytearray(np.packbits(genes).tobytes())
+
+    def genome(self):
+        """Geni kao uint8 NumPy niz."""
+        packed = np.frombuffer(self._bits, dtype=np.uint8)
+        return np.unpackbits(packed, count=self._size)
+
+    def key(self):
+        """Bajtovi genoma (isti kao predmemorija.genome_key)."""
+        return bytes(self._bits)
+
+    def __array__(self, dtype=None, copy=None):
+        genome = self.genome()
+        return genome if dtype is None else genome.astype(dtype)
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.genome()[index].tolist()
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("indeks gena izvan raspona")
+        return (self._bits[index >> 3] >> (7 - (index & 7))) & 1
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            genome = self.genome()
+            genome[index] = np.asarray(value, dtype=np.uint8)
+            self._bits[:] = np.packbits(genome).tobytes()
+            return
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("indeks gena izvan raspona")
+        mask = 1 << (7 - (index & 7))
+        if value:
+            self._bits[index >> 3] |= mask
+        else:
+            self._bits[index >> 3] &= ~mask & 0xFF
+
+    def __iter__(self):
+        return iter(self.genome().tolist())
+
+    def __eq__(self, other):
+        if isinstance(other, PackedBits):
+            return self._size == other._size and self._bits == other._bits
+        try:
+            return list(self) == list(other)
+        except TypeError:
+            return NotImplemented
+
+    def __hash__(self):
+        # Ovisi o genima: jedinka se ne smije mijenjati dok je ključ u rječniku
+        return hash((self._size, bytes(self._bits)))
+
+    def __deepcopy__(self, memo):
+        clone = self.__class__.__new__(self.__class__)
+        clone._size = self._size
+        clone._bits = bytearray(self._bits)
+        for name, value in self.__dict__.items():
+            if name not in ("_size", "_bits"):
+                setattr(clone, name, copy.deepcopy(value, memo))
+        return clone
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.genome().tolist()})"
+
+    @property
+    def nbytes(self):
+        """Memorija genoma u bajtovima."""
+        return len(self._bits)
@@ -0,0 +1,196 @@
+"""Paralelna evaluacija populacije (bazen procesa) - zajednički modul - diplomski rad - Neven Nižić"""
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from types import SimpleNamespace
+import weakref
+
+import numpy as np
+
+import evaluacija
+import monte_carlo
+
+# Procijenjeni posao generacije (jedinke × aktivnosti × simulacije) ispod kojeg
+# se evaluira u pozivajućem procesu; male instance (npr. A1, A3) ostaju serijske
+MIN_PARALLEL_WORK = 20_000_000
+
+# Zadani broj jedinki po bloku; ne ovisi o broju radnika, pa ni rezultat
+CHUNK_SIZE = 32
+
+# Ključevi CONFIG-a koje radnik treba za evaluaciju (šalju se jednom)
+_SETTINGS = (
+    "BUDGET",
+    "NUM_SIMULATIONS",
+    "DURATION_OBJECTIVE",
+    "DURATION_ALPHA",
+    "DEADLINE",
+    "CORRELATION",
+    "SCHEDULE",
+    "ANALYTIC",
+    "DISTRIBUTION",
+)
+
+# Stanje procesa radnika: evaluator i otvoreni blokovi dijeljene memorije
+_worker = {}
+
+
+def share_arrays(arrays):
+    """Kopira NumPy nizove u dijeljenu memoriju.
+
+    Vraća (blokovi, opis), gdje je opis rječnik ime -> (ime bloka, oblik, dtype)
+    dovoljan radniku da se spoji na iste podatke bez kopiranja.
+    """
+    blocks, spec = [], {}
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+        blocks.append(block)
+        spec[name] = (block.name, array.shape, array.dtype.str)
+    return blocks, spec
+
+
+def attach_arrays(spec):
+    """Spaja se na nizove iz share_arrays; vraća (blokovi, rječnik nizova)."""
+    blocks, arrays = [], {}
+    for name, (block_name, shape, dtype) in spec.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        blocks.append(block)
+        arrays[name] = np.ndarray(shape, dtype, buffer=block.buf)
+    return blocks, arrays
+
+
+def _init_worker(spec, settings, multi_objective):
+    """Inicijalizator radnika: spaja se na dijeljene nizove i gradi evaluator."""
+    blocks, arrays = attach_arrays(spec)
+    config = dict(settings)
+    if "samples" in arrays:
+        # Zamjena za CommonRandomNumbers nad dijeljenom matricom uzoraka
+        config["CRN"] = SimpleNamespace(
+            samples=arrays["samples"], column_means=arrays["column_means"]
+        )
+    _worker["blocks"] = blocks
+    _worker["evaluator"] = evaluacija.BatchEvaluator.from_arrays(
+        arrays["cost"],
+        arrays["roi"],
+        (arrays["low"], arrays["mode"], arrays["high"]),
+        config,
+        multi_objective,
+    )
+
+
+def _evaluate_chunk(packed, num_activities, rng):
+    """Evaluira blok jedinki (zapakiranih bitova) u procesu radniku.
+
+    Vraća (fitness vrijednosti, broj uzorkovanih trajanja).
+    """
+    evaluator = _worker["evaluator"]
+    evaluator.rng = rng
+    monte_carlo.reset_draw_count()
+    genomes = np.unpackbits(packed, axis=1, count=num_activities)
+    return evaluator.evaluate_matrix(genomes), monte_carlo.draw_count()
+
+
+def _release(executor, blocks):
+    executor.shutdown(wait=True, cancel_futures=True)
+    for block in blocks:
+        block.close()
+        block.unlink()
+
+
+class ParallelEvaluator:
+    """Evaluacija generacije u bazenu procesa (registrira se kao 'evaluate' i 'map').
+
+    Troškovi, ROI, parametri trajanja i zajednička matrica uzoraka (CRN)
+    stavljaju se jednom u dijeljenu memoriju, pa se radnicima po zadatku šalju
+    samo jedinke, zapakirane po bitovima i podijeljene u blokove od
+    'chunk_size' jedinki. Svaki blok evaluira se kao u evaluacija.BatchEvaluator,
+    s vlastitim generatorom izvedenim iz 'rng', pa rezultat ne ovisi o broju
+    radnika ni o tome koji radnik obradi blok. Generacije s procijenjenim
+    poslom (jedinke × aktivnosti × simulacije) manjim od 'min_work'
+    evaluiraju se po istim blokovima u pozivajućem procesu. Bazen i dijeljena
+    memorija oslobađaju se s close() (ili izlaskom iz bloka with) ili kad
+    evaluator više nije referenciran.
+    """
+
+    def __init__(
+        self,
+        activities,
+        config,
+        workers,
+        multi_objective=False,
+        rng=None,
+        chunk_size=None,
+        min_work=MIN_PARALLEL_WORK,
+    ):
+        self.workers = workers
+        self.chunk_size = chunk_size or CHUNK_SIZE
+        self.min_work = min_work
+        self.rng = monte_carlo.get_rng() if rng is None else rng
+        self.local = evaluacija.BatchEvaluator(activities, config, multi_objective, rng)
+        self.num_activities = len(activities)
+        # Jedno-objektivna evaluacija nema simulacija trajanja
+        simulations = config["NUM_SIMULATIONS"] if multi_objective else 1
+        self.work_per_individual = self.num_activities * simulations
+
+        cost, roi = evaluacija.metric_arrays(activities)
+        low, mode, high = monte_carlo.activity_parameters(activities)
+        arrays = {"cost": cost, "roi": roi, "low": low, "mode": mode, "high": high}
+        crn = config.get("CRN")
+        if crn is not None:
+            arrays["samples"] = crn.samples
+            arrays["column_means"] = crn.column_means
+        blocks, spec = share_arrays(arrays)
+        # Samo postavljeni ključevi, pa radnik vidi iste zadane vrijednosti
+        settings = {key: config[key] for key in _SETTINGS if key in config}
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(spec, settings, multi_objective),
+        )
+        self._finalizer = weakref.finalize(self, _release, self.executor, blocks)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __call__(self, individual):
+        """Evaluacija jedne jedinke (u pozivajućem procesu)."""
+        return self.map(self, [individual])[0]
+
+    def map(self, func, individuals):
+        """Zamjena za ugrađeni map; evaluaciju dijeli po radnicima u blokovima."""
+        # toolbox.register omata funkciju u functools.partial
+        if getattr(func, "func", func) is not self:
+            return map(func, individuals)
+        individuals = list(individuals)
+        if not individuals:
+            return []
+        genomes = evaluacija.pack_population(individuals)
+        blocks = [
+            genomes[start : start + self.chunk_size]
+            for start in range(0, len(genomes), self.chunk_size)
+        ]
+        rngs = self.rng.spawn(len(blocks))
+        fitnesses = []
+        if len(genomes) * self.work_per_individual < self.min_work:
+            for block, rng in zip(blocks, rngs):
+                self.local.rng = rng
+                fitnesses.extend(self.local.evaluate_matrix(block))
+            return fitnesses
+        results = self.executor.map(
+            _evaluate_chunk,
+            [np.packbits(block, axis=1) for block in blocks],
+            [self.num_activities] * len(blocks),
+            rngs,
+        )
+        for chunk, draws in results:
+            fitnesses.extend(chunk)
+            monte_carlo.add_draws(draws)
+        return fitnesses
+
+    def close(self):
+        """Gasi bazen procesa i briše dijeljenu memoriju."""
+        self._finalizer()
@@ -0,0 +1,56 @@
+"""Predmemorija fitness vrijednosti (LRU) - zajednički modul - diplomski rad - Neven Nižić"""
+
+from collections import OrderedDict
+
+import numpy as np
+
+import pakirana
+
+# Zadani najveći broj spremljenih jedinki
+DEFAULT_MAXSIZE = 10_000
+
+
+def genome_key(individual):
+    """Ključ jedinke: bajtovi np.packbits bool niza gena."""
+    if isinstance(individual, pakirana.PackedBits):
+        return individual.key()
+    return np.packbits(np.asarray(individual, dtype=bool)).tobytes()
+
+
+class FitnessCache:
+    """Omotač fitness funkcije koji pamti rezultate po genomu jedinke.
+
+    Poziva se kao i omotana funkcija (jedinka je prvi argument, ostali se
+    prosljeđuju). Ključ ne uključuje ostale argumente, pa oni moraju biti isti
+    za sve pozive (npr. functools.partial s aktivnostima i CONFIG-om). Kad broj
+    spremljenih jedinki prijeđe 'maxsize', izbacuje se najdavnije korištena.
+    """
+
+    def __init__(self, func, maxsize=DEFAULT_MAXSIZE):
+        self.func = func
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, individual, *args, **kwargs):
+        key = genome_key(individual)
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+        self.misses += 1
+        value = self.func(individual, *args, **kwargs)
+        self.entries[key] = value
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+        return value
+
+    def hit_rate(self, _values=None):
+        """Udio poziva riješenih iz predmemorije.
+
+        Prihvaća (i zanemaruje) argument kako bi se mogla registrirati kao
+        tools.Statistics funkcija i bilježiti u logbook.
+        """
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else 0.0
@@ -0,0 +1,104 @@
+"""Kritični put projekta s ovisnostima aktivnosti - zajednički modul - diplomski rad - Neven Nižić"""
+
+import numpy as np
+
+import aktivnosti
+
+
+def topological_levels(predecessors):
+    """Razine DAG-a: aktivnost je na razini 1 + najveća razina prethodnika.
+
+    'predecessors' je lista listi indeksa prethodnika. Vraća niz razina po
+    aktivnostima; ciklus u ovisnostima javlja ValueError.
+    """
+    n = len(predecessors)
+    level = np.zeros(n, dtype=int)
+    indegree = np.array([len(preds) for preds in predecessors])
+    successors = [[] for _ in range(n)]
+    for i, preds in enumerate(predecessors):
+        for p in preds:
+            successors[p].append(i)
+
+    # Kahnov algoritam
+    ready = [i for i in range(n) if indegree[i] == 0]
+    visited = 0
+    while ready:
+        i = ready.pop()
+        visited += 1
+        for s in successors[i]:
+            level[s] = max(level[s], level[i] + 1)
+            indegree[s] -= 1
+            if indegree[s] == 0:
+                ready.append(s)
+    if visited != n:
+        raise ValueError("Ovisnosti aktivnosti sadrže ciklus.")
+    return level
+
+
+class CriticalPath:
+    """Trajanje projekta kao najdulji put u DAG-u odabranih aktivnosti.
+
+    Aktivnost počinje kad završe sve odabrane aktivnosti od kojih ovisi,
+    izravno ili preko neodabranih aktivnosti (tranzitivno zatvorenje nad
+    odabranim podskupom): uz A→B→C i neodabrani B, C i dalje čeka A.
+    Neodabrana aktivnost zato se računa kao čvor trajanja nula koji samo
+    prenosi završetak svojih prethodnika. Čvorovi se obrađuju po razinama
+    topološkog poretka, a svaka razina odjednom za sve simulacije (max/zbroj
+    po osi uzoraka), bez Python petlje po simulacijama. Pomoćne matrice
+    (simulacije × aktivnosti) alociraju se jednom po broju simulacija.
+    """
+
+    def __init__(self, activities):
+        if isinstance(activities, aktivnosti.ActivitySet):
+            predecessors = activities.predecessor_lists()
+        else:
+            predecessors = [list(act.get("predecessors", [])) for act in activities]
+        self.size = len(predecessors)
+        levels = topological_levels(predecessors)
+        self.levels = []
+        for value in range(levels.max() + 1 if self.size else 0):
+            nodes = np.flatnonzero(levels == value)
+            width = max(len(predecessors[i]) for i in nodes)
+            # Prethodnici nadopunjeni indeksom stupca koji je uvijek nula
+            padded = np.full((len(nodes), max(width, 1)), self.size)
+            for row, i in enumerate(nodes):
+                padded[row, : len(predecessors[i])] = predecessors[i]
+            self.levels.append((nodes, padded if width else None))
+        self._buffers = None
+
+    def __getstate__(self):
+        # Pomoćne matrice se ne šalju drugim procesima
+        return dict(self.__dict__, _buffers=None)
+
+    def _scratch(self, num_simulations):
+        """Pomoćne matrice (trajanja, završeci) za 'num_simulations' simulacija."""
+        if self._buffers is None or len(self._buffers[0]) != num_simulations:
+            # Zadnji stupac (indeks self.size) je uvijek nula: popuna prethodnika
+            self._buffers = (
+                np.zeros((num_simulations, self.size + 1)),
+                np.zeros((num_simulations, self.size + 1)),
+            )
+        return self._buffers
+
+    def makespans(self, samples, columns):
+        """Trajanje projekta u svakoj simulaciji.
+
+        'samples' su trajanja (simulacije × odabrane aktivnosti), a 'columns'
+        indeksi tih aktivnosti u instanci.
+        """
+        num_simulations = len(samples)
+        if len(columns) == 0:
+            return np.zeros(num_simulations)
+        durations, finish = self._scratch(num_simulations)
+        durations.fill(0.0)
+        durations[:, columns] = samples
+
+        # Svaki čvor (i neodabrani, s trajanjem nula) prepisuje svoj završetak,
+        # pa 'finish' ne treba brisati između poziva
+        for nodes, padded in self.levels:
+            if padded is None:
+                finish[:, nodes] = durations[:, nodes]
+                continue
+            start = finish[:, padded].max(axis=2)
+            finish[:, nodes] = durations[:, nodes] + start
+        return finish.max(axis=1)
@@ -0,0 +1,195 @@
+"""Egzaktno rješenje 0/1 problema ruksaka (ROI uz budžet) - diplomski rad - Neven Nižić"""
+
+import numpy as np
+
+# Najveći broj ćelija (aktivnosti × budžet) za dinamičko programiranje s
+# rekonstrukcijom odabira (matrica odluka u memoriji)
+MAX_DP_CELLS = 50_000_000
+
+# Najveći broj ćelija za DP samo po vrijednosti (jedan redak, O(budžet)
+# memorije); iznad toga i za necjelobrojne troškove koristi se B&B
+MAX_VALUE_DP_CELLS = 5_000_000_000
+
+# Najveći broj čvorova grananja i ograđivanja; nakon toga vraća se najbolje
+# nađeno rješenje i gornja granica, a odstupanje je približno
+MAX_NODES = 200_000
+
+
+def fractional_upper_bound(cost, value, budget):
+    """Gornja granica ROI-a iz LP relaksacije (razlomljeni ruksak)."""
+    cost = np.asarray(cost, dtype=float)
+    value = np.asarray(value, dtype=float)
+    useful = (value > 0) & (cost <= budget)
+    free = useful & (cost == 0)
+    paid = useful & ~free
+    order = _ratio_order(cost[paid], value[paid])
+    bound = _greedy_bound(cost[paid][order], value[paid][order], budget)
+    return float(value[free].sum()) + bound
+
+
+def knapsack_dp(cost, value, budget):
+    """Dinamičko programiranje po budžetu, vektorizirano preko svih kapaciteta.
+
+    Troškovi moraju biti cijeli brojevi. Vraća (optimalni ROI, bool niz odabira).
+    """
+    cost = np.asarray(cost).astype(int)
+    value = np.asarray(value, dtype=float)
+    budget = int(budget)
+    n = len(cost)
+
+    # best[w] = najveći ROI uz ukupni trošak najviše w
+    best = np.zeros(budget + 1)
+    take = np.zeros((n, budget + 1), dtype=bool)
+    for i in range(n):
+        c = cost[i]
+        if c > budget or value[i] <= 0:
+            continue
+        candidate = best[: budget + 1 - c] + value[i]
+        better = candidate > best[c:]
+        take[i, c:] = better
+        best[c:] = np.where(better, candidate, best[c:])
+
+    # Rekonstrukcija rješenja od zadnje aktivnosti prema prvoj
+    selection = np.zeros(n, dtype=bool)
+    w = budget
+    for i in range(n - 1, -1, -1):
+        if take[i, w]:
+            selection[i] = True
+            w -= cost[i]
+    return float(best[budget]), selection
+
+
+def knapsack_dp_value(cost, value, budget):
+    """Optimalni ROI dinamičkim programiranjem s jednim retkom (bez odabira).
+
+    Memorija je O(budžet) umjesto O(aktivnosti × budžet), pa je prikladno za
+    velike instance kad je potrebna samo vrijednost optimuma.
+    """
+    cost = np.asarray(cost).astype(int)
+    value = np.asarray(value, dtype=float)
+    budget = int(budget)
+    best = np.zeros(budget + 1)
+    for i in np.flatnonzero((cost <= budget) & (value > 0)):
+        c = cost[i]
+        # Desna strana računa se cijela prije dodjele, pa se čitaju stare vrijednosti
+        best[c:] = np.maximum(best[c:], best[: budget + 1 - c] + value[i])
+    return float(best[budget])
+
+
+def knapsack_branch_and_bound(cost, value, budget, max_nodes=MAX_NODES):
+    """Grananje i ograđivanje (DFS) s granicom razlomljenog ruksaka.
+
+    Ne zahtijeva cjelobrojne troškove niti memoriju proporcionalnu budžetu.
+    Vraća (ROI, bool niz odabira, gornja granica). Ako se pretraga završi
+    unutar 'max_nodes' čvorova, granica je jednaka ROI-u (dokazani optimum);
+    inače je ROI najbolje nađeno rješenje, a granica najveća LP granica
+    neistraženih čvorova.
+    """
+    cost = np.asarray(cost, dtype=float)
+    value = np.asarray(value, dtype=float)
+    n = len(cost)
+    selection = np.zeros(n, dtype=bool)
+
+    # Aktivnosti bez troška i s pozitivnim ROI-em uvijek se odabiru
+    free = (cost == 0) & (value > 0)
+    selection[free] = True
+    candidates = np.flatnonzero((cost > 0) & (cost <= budget) & (value > 0))
+    candidates = candidates[_ratio_order(cost[candidates], value[candidates])]
+    c, v = cost[candidates], value[candidates]
+    m = len(candidates)
+    # Prefiksne sume za granicu u O(log n) po čvoru
+    prefix_cost = np.concatenate(([0.0], np.cumsum(c)))
+    prefix_value = np.concatenate(([0.0], np.cumsum(v)))
+
+    best_value, best_chain = 0.0, None
+    # Čvor: (razina, ROI, trošak, lanac odabranih indeksa kao (indeks, roditelj))
+    stack = [(0, 0.0, 0.0, None)]
+    nodes = 0
+    while stack and nodes < max_nodes:
+        nodes += 1
+        level, val, weight, chain = stack.pop()
+        if val > best_value:
+            best_value, best_chain = val, chain
+        if level == m:
+            continue
+        bound = _prefix_bound(prefix_cost, prefix_value, level, budget - weight)
+        if val + bound <= best_value:
+            continue
+        # Grana bez aktivnosti ide na stog prva, pa se grana s aktivnošću
+        # (pohlepni smjer) istražuje prva
+        stack.append((level + 1, val, weight, chain))
+        if weight + c[level] <= budget:
+            stack.append((level + 1, val + v[level], weight + c[level], (level, chain)))
+
+    # Neistraženi čvorovi (prekid zbog 'max_nodes') ograničavaju optimum odozgo
+    bound = best_value
+    for level, val, weight, _ in stack:
+        bound = max(
+            bound,
+            val + _prefix_bound(prefix_cost, prefix_value, level, budget - weight),
+        )
+
+    while best_chain is not None:
+        level, best_chain = best_chain
+        selection[candidates[level]] = True
+    free_value = value[free].sum()
+    return best_value + free_value, selection, bound + free_value
+
+
+def solve_knapsack(
+    cost,
+    value,
+    budget,
+    max_cells=MAX_DP_CELLS,
+    max_value_cells=MAX_VALUE_DP_CELLS,
+    max_nodes=MAX_NODES,
+):
+    """Optimum ROI-a uz budžet; vraća (ROI, bool niz odabira ili None, gornja granica).
+
+    Za cjelobrojne troškove koristi se DP (s odabirom do 'max_cells' ćelija,
+    samo vrijednost do 'max_value_cells'), inače grananje i ograđivanje s
+    najviše 'max_nodes' čvorova. ROI je dokazani optimum kad je jednak gornjoj
+    granici; inače je to najbolje nađeno rješenje.
+    """
+    cost = np.asarray(cost, dtype=float)
+    integral = np.all(cost == np.round(cost)) and float(budget).is_integer()
+    cells = len(cost) * (int(budget) + 1)
+    if integral and cells <= max_cells:
+        optimum, selection = knapsack_dp(cost, value, budget)
+        return optimum, selection, optimum
+    if integral and cells <= max_value_cells:
+        optimum = knapsack_dp_value(cost, value, budget)
+        return optimum, None, optimum
+    return knapsack_branch_and_bound(cost, value, budget, max_nodes)
+
+
+def _ratio_order(cost, value):
+    """Indeksi aktivnosti po padajućem omjeru ROI/trošak."""
+    return np.argsort(-(value / cost), kind="stable")
+
+
+def _greedy_bound(cost_sorted, value_sorted, capacity):
+    """Razlomljeni ruksak nad aktivnostima već sortiranim po omjeru ROI/trošak."""
+    prefix_cost = np.concatenate(([0.0], np.cumsum(cost_sorted)))
+    prefix_value = np.concatenate(([0.0], np.cumsum(value_sorted)))
+    return _prefix_bound(prefix_cost, prefix_value, 0, capacity)
+
+
+def _prefix_bound(prefix_cost, prefix_value, level, capacity):
+    """Razlomljeni ruksak nad sortiranim aktivnostima od indeksa 'level' nadalje.
+
+    'prefix_cost' i 'prefix_value' su prefiksne sume s vodećom nulom.
+    """
+    if capacity <= 0:
+        return 0.0
+    # Zadnji indeks 'end' za koji aktivnosti level..end-1 cijele stanu
+    end = int(
+        np.searchsorted(prefix_cost, prefix_cost[level] + capacity, side="right") - 1
+    )
+    bound = prefix_value[end] - prefix_value[level]
+    if end < len(prefix_cost) - 1:
+        remaining = capacity - (prefix_cost[end] - prefix_cost[level])
+        item_cost = prefix_cost[end + 1] - prefix_cost[end]
+        item_value = prefix_value[end + 1] - prefix_value[end]
+        bound += item_value * remaining / item_cost
+    return float(bound)
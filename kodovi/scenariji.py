@@ -0,0 +1,936 @@
+"""Usporedba scenarija (Random Search, GA, NSGA-II) - zajednički modul - diplomski rad - Neven Nižić
+
+Konfiguracija, pokretanje scenarija i skupljanje rezultata zajednički su za
+usporedba_scenarija_konvergencija.py i usporedba_scenarija_pareto.py; skripte
+se razlikuju samo po tome što izvoze za vizualizaciju (EXPORTS).
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import random
+
+from deap import algorithms, base, creator, tools
+import numpy as np
+import pandas as pd
+
+import aktivnosti
+import distribucija
+import evaluacija
+import heuristike
+import inkrementalna
+import instance
+import korelacija
+import monte_carlo
+import nsga2
+import ruksak
+import numpy_ga
+import otoci
+import pakirana
+import paralelno
+import predmemorija
+import raspored
+import sjeme
+import ucitavanje
+import zaustavljanje
+
+# ==============================================================================
+# GLAVNI KONFIGURACIJSKI RJEČNIK (zajednički za obje skripte)
+# ==============================================================================
+CONFIG = {
+    "SEED": 42,
+    "RUNS": 10,  # Broj ponavljanja za statističku značajnost
+    "NUM_SIMULATIONS": 100,  # Broj iteracija za Monte Carlo procjenu trajanja
+    # Jedna matrica uzoraka trajanja po instanci, dijeljena među svim evaluacijama
+    "COMMON_RANDOM_NUMBERS": False,
+    # "monte_carlo", "analytic" (prosječno trajanje kao egzaktni zbroj
+    # (a + m + b) / 3 odabranih aktivnosti, bez uzorkovanja) ili "convolution"
+    # (egzaktna razdioba zbroja FFT konvolucijom na mreži koraka GRID_STEP)
+    "DURATION_MODE": "monte_carlo",
+    "GRID_STEP": 0.5,
+    # Adaptivni Monte Carlo: uzorkovanje u blokovima od MC_BATCH simulacija dok
+    # relativna standardna pogreška prosjeka ne padne na MC_TOLERANCE (najviše
+    # NUM_SIMULATIONS tijekom evolucije), a za konačno prijavljeno trajanje na
+    # MC_FINAL_TOLERANCE (najviše MC_FINAL_MAX_SIMULATIONS). Samo uz evaluaciju
+    # po jedinki; uz BATCH/DELTA_EVALUATION, EVALUATION_WORKERS ili
+    # COMMON_RANDOM_NUMBERS javlja grešku
+    "ADAPTIVE_MC": False,
+    "MC_BATCH": 25,
+    "MC_TOLERANCE": 0.01,
+    "MC_FINAL_TOLERANCE": 0.001,
+    "MC_FINAL_MAX_SIMULATIONS": 10_000,
+    # Korelirana trajanja (Gaussova kopula): None, "factor" (faktorski model,
+    # brz i za tisuće aktivnosti) ili "dense" (Cholesky guste matrice). Aktivnosti
+    # su nasumično podijeljene u CORRELATION_FACTORS skupina s međusobnom
+    # korelacijom CORRELATION_STRENGTH; analitički model (prosjek) na nju ne
+    # ovisi, a konvolucija pretpostavlja nezavisnost pa uz nju javlja grešku
+    "CORRELATION_MODEL": None,
+    "CORRELATION_FACTORS": 3,
+    "CORRELATION_STRENGTH": 0.5,
+    # "serial" (trajanje je zbroj odabranih aktivnosti) ili "critical_path"
+    # (najdulji put kroz ovisnosti odabranih aktivnosti; samo uz monte_carlo)
+    "DURATION_MODEL": "serial",
+    # Najveći broj prethodnika aktivnosti u generiranim podatcima
+    "MAX_PREDECESSORS": 3,
+    # Uzorkovanje kandidata slučajne pretrage: "uniform" (svaka aktivnost s
+    # vjerojatnošću 0.5) ili "feasible" (punjenje budžeta slučajnim poretkom)
+    "RANDOM_SEARCH_SAMPLER": "uniform",
+    # Drugi cilj NSGA-II: "mean", "quantile" (kvantil razine DURATION_ALPHA),
+    # "cvar" (prosjek najduljih 1 - DURATION_ALPHA simulacija) ili "deadline"
+    # (vjerojatnost prekoračenja roka DEADLINE)
+    "DURATION_OBJECTIVE": "mean",
+    "DURATION_ALPHA": 0.9,
+    "DEADLINE": None,
+    # Evaluacija cijele generacije jednim vektoriziranim pozivom (toolbox.map)
+    "BATCH_EVALUATION": False,
+    # "deap" ili "numpy" (NumPy GA za GA (samo ROI), NumPy selekcija za NSGA-II)
+    "ENGINE": "deap",
+    # Rano zaustavljanje GA: dosegnut optimum/LP granica ROI-a, stagnacija kuće
+    # slavnih kroz STAGNATION_GENERATIONS generacija ili TIME_LIMIT sekundi
+    "EARLY_STOPPING": False,
+    "STAGNATION_GENERATIONS": 30,
+    "TIME_LIMIT": None,
+    # Udio početne populacije iz nasumičnog pohlepnog punjenja po omjeru ROI/trošak
+    "GREEDY_SEED_FRACTION": 0.0,
+    # Popravak potomaka iznad budžeta izbacivanjem aktivnosti najlošijeg omjera
+    "REPAIR": False,
+    # Jedinke nose zbrojeve (trošak, ROI, trajanja po simulaciji uz CRN) koje
+    # mutacija i križanje ažuriraju samo za promijenjene gene
+    "DELTA_EVALUATION": False,
+    # Najveći broj jedinki u LRU predmemoriji fitnessa (0 isključuje); Monte
+    # Carlo cilj pamti se samo uz COMMON_RANDOM_NUMBERS
+    "FITNESS_CACHE_SIZE": 0,
+    # Model otoka (samo ENGINE "deap"): ISLANDS > 1 dijeli populaciju na otoke
+    # koji evoluiraju u zasebnim procesima (ISLAND_PROCESSES) i svakih
+    # MIGRATION_INTERVAL generacija šalju MIGRATION_SIZE najboljih jedinki
+    # susjedima prema topologiji "ring" ili "full"
+    "ISLANDS": 1,
+    "ISLAND_PROCESSES": True,
+    "MIGRATION_INTERVAL": 10,
+    "MIGRATION_SIZE": 2,
+    "MIGRATION_TOPOLOGY": "ring",
+    # Evaluacija generacije u bazenu od EVALUATION_WORKERS procesa (0 = isključeno)
+    # s podatcima instance u dijeljenoj memoriji. Jedinke se dijele u blokove
+    # od EVALUATION_CHUNK_SIZE (None = 32), pa rezultat ne ovisi o broju
+    # radnika; generacije s poslom (jedinke × aktivnosti × simulacije) manjim
+    # od EVALUATION_MIN_WORK evaluiraju se serijski
+    "EVALUATION_WORKERS": 0,
+    "EVALUATION_CHUNK_SIZE": None,
+    "EVALUATION_MIN_WORK": 20_000_000,
+    # Jedinke s genima pakiranim u bitove (pakirana.PackedBits) umjesto liste
+    "PACKED_INDIVIDUALS": False,
+    # Generator instanci: "legacy" (generate_data) ili "vectorized"
+    # (instance.generate s INSTANCE_PARAMS, za 10^4 - 10^6 aktivnosti); uz
+    # INSTANCE_CACHE (direktorij) instance se spremaju na disk i mapiraju
+    "INSTANCE_GENERATOR": "legacy",
+    "INSTANCE_PARAMS": {},
+    "INSTANCE_CACHE": None,
+    # Eksperiment s ključem "DATA_PATH" (.csv, .parquet ili pretvorena instanca)
+    # umjesto generiranih podataka učitava stvarni portfelj, a NUM_ACTIVITIES
+    # je broj njegovih aktivnosti; uz DATA_CACHE (direktorij) tablica se
+    # pretvara jednom, a zatim memorijski mapira
+    "DATA_CACHE": None,
+    "experimental_series": [
+        # Serija A: Testiranje Skalabilnosti
+        {
+            "name": "A1_Osnovni",
+            "NUM_ACTIVITIES": 10,
+            "BUDGET": 1000,
+            "POP_SIZE": 100,
+            "NGEN": 40,
+            "CX_PB": 0.7,
+            "MUT_PB": 0.2,
+        },
+        {
+            "name": "A2_Srednji",
+            "NUM_ACTIVITIES": 50,
+            "BUDGET": 2500,
+            "POP_SIZE": 200,
+            "NGEN": 150,
+            "CX_PB": 0.7,
+            "MUT_PB": 0.2,
+        },
+        {
+            "name": "A3_Slozeni",
+            "NUM_ACTIVITIES": 100,
+            "BUDGET": 5000,
+            "POP_SIZE": 250,
+            "NGEN": 200,
+            "CX_PB": 0.7,
+            "MUT_PB": 0.2,
+        },
+        # Serija B: Testiranje Utjecaja Ograničenja (koristi istu složenost kao A2)
+        {
+            "name": "B1_Restriktivan",
+            "NUM_ACTIVITIES": 50,
+            "BUDGET": 1500,
+            "POP_SIZE": 200,
+            "NGEN": 150,
+            "CX_PB": 0.7,
+            "MUT_PB": 0.2,
+        },
+        {
+            "name": "B3_Labav",
+            "NUM_ACTIVITIES": 50,
+            "BUDGET": 4000,
+            "POP_SIZE": 200,
+            "NGEN": 150,
+            "CX_PB": 0.7,
+            "MUT_PB": 0.2,
+        },
+    ],
+}
+
+# Inicijalizacija generatora slučajnih brojeva
+random.seed(CONFIG["SEED"])
+np.random.seed(CONFIG["SEED"])
+monte_carlo.seed(CONFIG["SEED"])
+
+# Kreiranje DEAP tipova (jednom na početku)
+creator.create("FitnessMax", base.Fitness, weights=(1.0,))
+creator.create("Individual", list, fitness=creator.FitnessMax)
+creator.create("FitnessMulti", base.Fitness, weights=(1.0, -1.0))
+creator.create("IndividualMulti", list, fitness=creator.FitnessMulti)
+creator.create("PackedIndividual", pakirana.PackedBits, fitness=creator.FitnessMax)
+creator.create(
+    "PackedIndividualMulti", pakirana.PackedBits, fitness=creator.FitnessMulti
+)
+
+
+# ==============================================================================
+# POMOĆNE FUNKCIJE
+# ==============================================================================
+def generate_data(config, rng=random):
+    """Generira slučajne aktivnosti na temelju konfiguracije.
+
+    'rng' je random.Random toka eksperimenta (zadano: globalni modul random).
+    Vraća aktivnosti.ActivitySet (stupci NumPy nizova).
+    """
+    activities = [
+        {
+            "id": i,
+            "cost": rng.randint(50, 200),
+            "optimistic": rng.randint(5, 10),
+            "realistic": rng.randint(10, 20),
+            "pessimistic": rng.randint(20, 40),
+            "roi": round(rng.uniform(1.0, 3.0), 2),
+        }
+        for i in range(config["NUM_ACTIVITIES"])
+    ]
+    # Prethodnici se biraju među ranijim aktivnostima (graf je aciklički);
+    # izvlače se nakon ostalih atributa kako bi oni ostali nepromijenjeni
+    for i, act in enumerate(activities):
+        count = min(i, rng.randint(0, config["MAX_PREDECESSORS"]))
+        act["predecessors"] = sorted(rng.sample(range(i), count))
+    return aktivnosti.ActivitySet.from_dicts(activities)
+
+
+def calculate_metrics(individual, activities):
+    """Vraća ukupni trošak i ROI."""
+    cost, roi = evaluacija.metric_arrays(activities)
+    mask = np.asarray(individual, dtype=bool)
+    return cost[mask].sum(), roi[mask].sum()
+
+
+def simulated_totals(individual, activities, config, rng=None, final=False):
+    """Ukupna trajanja jedinke u svježim simulacijama.
+
+    Uz ADAPTIVE_MC broj simulacija određuje tražena preciznost: gruba tijekom
+    evolucije, a visoka za konačno prijavljeno trajanje (final=True).
+    """
+    correlation, schedule = config.get("CORRELATION"), config.get("SCHEDULE")
+    if not config["ADAPTIVE_MC"]:
+        return monte_carlo.simulated_totals(
+            individual,
+            activities,
+            config["NUM_SIMULATIONS"],
+            rng,
+            correlation,
+            schedule,
+        )
+    if final:
+        tolerance = config["MC_FINAL_TOLERANCE"]
+        max_simulations = config["MC_FINAL_MAX_SIMULATIONS"]
+    else:
+        tolerance, max_simulations = config["MC_TOLERANCE"], config["NUM_SIMULATIONS"]
+    return monte_carlo.adaptive_totals(
+        individual,
+        activities,
+        tolerance,
+        max_simulations,
+        config["MC_BATCH"],
+        rng,
+        correlation,
+        schedule,
+    )
+
+
+def monte_carlo_eval_duration(individual, activities, config, rng=None, final=False):
+    """Računa prosječno trajanje pomoću Monte Carlo simulacije."""
+    # Konvolucijski model daje prosjek egzaktne (diskretizirane) razdiobe
+    if config.get("DISTRIBUTION") is not None:
+        return config["DISTRIBUTION"].distribution(individual).mean()
+    # Analitički model daje egzaktno očekivanje bez uzorkovanja
+    if config.get("ANALYTIC") is not None:
+        return config["ANALYTIC"].mean_duration(individual)
+    # Ako je za instancu pripremljena zajednička matrica uzoraka, koristi nju
+    if config.get("CRN") is not None:
+        return config["CRN"].mean_duration(individual)
+    return float(simulated_totals(individual, activities, config, rng, final).mean())
+
+
+def duration_objective(individual, activities, config, rng=None):
+    """Drugi cilj NSGA-II: prosjek ili rizična mjera trajanja (DURATION_OBJECTIVE)."""
+    if config["DURATION_OBJECTIVE"] == "mean":
+        return monte_carlo_eval_duration(individual, activities, config, rng)
+    if config.get("DISTRIBUTION") is not None:
+        return evaluacija.distribution_measure(individual, config)
+    # Kvantil, CVaR i rok trebaju razdiobu, pa se bez konvolucije uzorkuje
+    if config.get("CRN") is not None:
+        totals = config["CRN"].simulated_totals(individual)
+    else:
+        totals = simulated_totals(individual, activities, config, rng)
+    return float(evaluacija.duration_measure(totals, config))
+
+
+# ==============================================================================
+# FITNESS FUNKCIJE
+# ==============================================================================
+def single_objective_fitness(individual, activities, config):
+    """Jedno-objektivni cilj: maksimizirati ROI."""
+    total_cost, total_roi = calculate_metrics(individual, activities)
+    if total_cost > config["BUDGET"]:
+        return (-(total_cost - config["BUDGET"]),)
+    return (total_roi,)
+
+
+def multi_objective_fitness(individual, activities, config, rng=None):
+    """Više-objektivni cilj: maksimizirati ROI, minimizirati trajanje."""
+    total_cost, total_roi = calculate_metrics(individual, activities)
+    if total_cost > config["BUDGET"]:
+        return 0, 99999
+    avg_duration = duration_objective(individual, activities, config, rng)
+    return total_roi, avg_duration
+
+
+# ==============================================================================
+# FUNKCIJE ZA POKRETANJE SCENARIJA
+# ==============================================================================
+def run_random_search_once(config, activities, streams=None):
+    """Random Search - traži najbolje rješenje slučajnim generiranjem.
+
+    Isti broj evaluacija kao GA (POP_SIZE × NGEN), generiranih i evaluiranih
+    u blokovima (heuristike.random_search).
+    """
+    streams = sjeme.global_streams() if streams is None else streams
+    cost, roi = evaluacija.metric_arrays(activities)
+    best_ind, best_roi = heuristike.random_search(
+        cost,
+        roi,
+        config["BUDGET"],
+        config["POP_SIZE"] * config["NGEN"],
+        streams.np,
+        sampler=config["RANDOM_SEARCH_SAMPLER"],
+    )
+    if best_ind is None:
+        return 0, 0
+    return best_roi, monte_carlo_eval_duration(
+        best_ind, activities, config, streams.np, final=True
+    )
+
+
+def setup_evolution(
+    config,
+    activities,
+    individual_type,
+    fitness_func,
+    selection_func,
+    streams,
+    record_stats=False,
+    **kwargs,
+):
+    """Toolbox i početna populacija jednog GA (ili jednog otoka).
+
+    Vraća (toolbox, populacija, statistika); statistika fitnessa po generaciji
+    postoji samo uz record_stats, inače je None.
+    """
+    cache = None
+    toolbox = base.Toolbox()
+    toolbox.register("attr_bool", streams.py.randint, 0, 1)
+    toolbox.register(
+        "individual",
+        tools.initRepeat,
+        individual_type,
+        toolbox.attr_bool,
+        config["NUM_ACTIVITIES"],
+    )
+    toolbox.register("population", tools.initRepeat, list, toolbox.individual)
+    toolbox.register("mate", tools.cxTwoPoint)
+    toolbox.register("mutate", tools.mutFlipBit, indpb=0.1)
+    if config["DELTA_EVALUATION"]:
+        delta = inkrementalna.DeltaEvaluator(
+            activities,
+            config,
+            multi_objective=fitness_func is multi_objective_fitness,
+            rng=streams.np,
+        )
+        toolbox.register("evaluate", delta)
+        toolbox.register("mate", delta.mate)
+        toolbox.register("mutate", delta.mutate, indpb=0.1)
+    elif config["EVALUATION_WORKERS"] > 1:
+        evaluator = paralelno.ParallelEvaluator(
+            activities,
+            config,
+            config["EVALUATION_WORKERS"],
+            multi_objective=fitness_func is multi_objective_fitness,
+            rng=streams.np,
+            chunk_size=config["EVALUATION_CHUNK_SIZE"],
+            min_work=config["EVALUATION_MIN_WORK"],
+        )
+        toolbox.register("evaluate", evaluator)
+        toolbox.register("map", evaluator.map)
+        toolbox.register("close", evaluator.close)
+    elif config["BATCH_EVALUATION"]:
+        evaluator = evaluacija.BatchEvaluator(
+            activities,
+            config,
+            multi_objective=fitness_func is multi_objective_fitness,
+            rng=streams.np,
+        )
+        toolbox.register("evaluate", evaluator)
+        toolbox.register("map", evaluator.map)
+    else:
+        evaluate_partial = partial(fitness_func, activities=activities, config=config)
+        if fitness_func is multi_objective_fitness:
+            evaluate_partial = partial(evaluate_partial, rng=streams.np)
+        # Svježi MC uzorci daju različito trajanje za isti genom, pa se
+        # više-objektivni cilj pamti samo uz zajedničku matricu uzoraka ili
+        # analitičko trajanje
+        deterministic = (
+            config.get("CRN") is not None
+            or config.get("DISTRIBUTION") is not None
+            or (
+                config.get("ANALYTIC") is not None
+                and config["DURATION_OBJECTIVE"] == "mean"
+            )
+        )
+        if config["FITNESS_CACHE_SIZE"] and (
+            fitness_func is not multi_objective_fitness or deterministic
+        ):
+            cache = predmemorija.FitnessCache(
+                evaluate_partial, config["FITNESS_CACHE_SIZE"]
+            )
+            evaluate_partial = cache
+        toolbox.register("evaluate", evaluate_partial)
+    toolbox.register("select", selection_func, **kwargs)
+    cost, ratio = heuristike.cost_and_ratio(activities)
+    if config["REPAIR"]:
+        repair = heuristike.repair_decorator(cost, ratio, config["BUDGET"])
+        toolbox.decorate("mate", repair)
+        toolbox.decorate("mutate", repair)
+
+    pop = toolbox.population(n=config["POP_SIZE"])
+    # Dio početne populacije zamjenjuju pohlepno popunjene jedinke
+    num_greedy = int(round(config["GREEDY_SEED_FRACTION"] * config["POP_SIZE"]))
+    greedy = heuristike.greedy_population(
+        cost, ratio, config["BUDGET"], num_greedy, streams.np
+    )
+    for ind, genome in zip(pop, greedy):
+        ind[:] = genome.astype(int).tolist()
+    if not record_stats:
+        return toolbox, pop, None
+    stats = tools.Statistics(lambda ind: ind.fitness.values[0])
+    stats.register("avg", np.mean)
+    stats.register("std", np.std)
+    stats.register("min", np.min)
+    stats.register("max", np.max)
+    if cache is not None:
+        stats.register("cache_hit_rate", cache.hit_rate)
+    return toolbox, pop, stats
+
+
+def run_islands_once(
+    config,
+    activities,
+    individual_type,
+    fitness_func,
+    selection_func,
+    algorithm_func,
+    halloffame,
+    streams,
+    record_stats=False,
+    **kwargs,
+):
+    """GA modelom otoka; vraća (spojena kuća slavnih, spojeni logbook).
+
+    POP_SIZE se dijeli na ISLANDS jednakih potpopulacija, svaka s vlastitim
+    toolboxom (setup_evolution) i tokovima slučajnih brojeva.
+    """
+    island_size = max(config["POP_SIZE"] // config["ISLANDS"], 1)
+    island_config = dict(config, POP_SIZE=island_size)
+    algorithm = partial(algorithm_func, cxpb=config["CX_PB"], mutpb=config["MUT_PB"])
+    if algorithm_func != algorithms.eaSimple:
+        algorithm = partial(algorithm, mu=island_size, lambda_=island_size)
+    setup = partial(
+        setup_evolution,
+        island_config,
+        activities,
+        individual_type,
+        fitness_func,
+        selection_func,
+        record_stats=record_stats,
+        **kwargs,
+    )
+    return otoci.run_islands(
+        setup,
+        algorithm,
+        halloffame,
+        sjeme.split(streams, config["ISLANDS"]),
+        config["NGEN"],
+        config["MIGRATION_INTERVAL"],
+        config["MIGRATION_SIZE"],
+        config["MIGRATION_TOPOLOGY"],
+        processes=config["ISLAND_PROCESSES"],
+    )
+
+
+def run_ga_once(
+    config,
+    activities,
+    individual_type,
+    fitness_func,
+    selection_func,
+    algorithm_func,
+    streams=None,
+    return_logbook=False,
+    **kwargs,
+):
+    """Generička funkcija za pokretanje jedne instance GA.
+
+    'streams' su tokovi slučajnih brojeva zadatka (sjeme.Streams); bez njih
+    se koriste globalni generatori. Uz return_logbook vraća (rezultat,
+    logbook sa statistikom fitnessa po generaciji).
+    """
+    streams = sjeme.global_streams() if streams is None else streams
+
+    # Uz rano zaustavljanje koriste se DEAP petlje s provjerom kontrolera
+    controller = None
+    ea_simple, ea_mu_plus_lambda = algorithms.eaSimple, algorithms.eaMuPlusLambda
+    if config["EARLY_STOPPING"]:
+        controller = zaustavljanje.TerminationController.from_config(config, activities)
+        ea_simple = partial(zaustavljanje.ea_simple, controller=controller)
+        ea_mu_plus_lambda = partial(
+            zaustavljanje.ea_mu_plus_lambda, controller=controller
+        )
+
+    if config["ENGINE"] == "numpy" and algorithm_func == algorithms.eaSimple:
+        best_ind, logbook = numpy_ga.ea_simple(
+            config, activities, rng=streams.np, controller=controller, **kwargs
+        )
+        roi = single_objective_fitness(best_ind, activities, config)[0]
+        duration = monte_carlo_eval_duration(
+            best_ind, activities, config, streams.np, final=True
+        )
+        if return_logbook:
+            return (roi, duration), logbook
+        return roi, duration
+
+    halloffame = (
+        partial(tools.HallOfFame, 1)
+        if algorithm_func == algorithms.eaSimple
+        else tools.ParetoFront
+    )
+    if config["ISLANDS"] > 1:
+        hof, logbook = run_islands_once(
+            config,
+            activities,
+            individual_type,
+            fitness_func,
+            selection_func,
+            algorithm_func,
+            halloffame,
+            streams,
+            record_stats=return_logbook,
+            **kwargs,
+        )
+    else:
+        sjeme.seed_global_random(streams)
+        toolbox, pop, stats = setup_evolution(
+            config,
+            activities,
+            individual_type,
+            fitness_func,
+            selection_func,
+            streams,
+            record_stats=return_logbook,
+            **kwargs,
+        )
+        hof = halloffame()
+        try:
+            if algorithm_func == algorithms.eaSimple:
+                pop, logbook = ea_simple(
+                    pop,
+                    toolbox,
+                    cxpb=config["CX_PB"],
+                    mutpb=config["MUT_PB"],
+                    ngen=config["NGEN"],
+                    stats=stats,
+                    halloffame=hof,
+                    verbose=False,
+                )
+            else:
+                pop, logbook = ea_mu_plus_lambda(
+                    pop,
+                    toolbox,
+                    mu=config["POP_SIZE"],
+                    lambda_=config["POP_SIZE"],
+                    cxpb=config["CX_PB"],
+                    mutpb=config["MUT_PB"],
+                    ngen=config["NGEN"],
+                    stats=stats,
+                    halloffame=hof,
+                    verbose=False,
+                )
+        finally:
+            # Bazen procesa paralelne evaluacije gasi se i kad evolucija pukne
+            if hasattr(toolbox, "close"):
+                toolbox.close()
+
+    if not hof:
+        result = 0, 0
+    elif algorithm_func == algorithms.eaSimple:
+        best_ind = hof[0]
+        fitness_values = single_objective_fitness(best_ind, activities, config)
+        result = fitness_values[0], monte_carlo_eval_duration(
+            best_ind, activities, config, streams.np, final=True
+        )
+    else:
+        best_solution = max(hof, key=lambda ind: ind.fitness.values[0])
+        if config["DURATION_OBJECTIVE"] == "mean" and not config["ADAPTIVE_MC"]:
+            result = best_solution.fitness.values, hof
+        else:
+            # U rezultatima Trajanje je prosjek (uz ADAPTIVE_MC visoke
+            # preciznosti); rizična mjera je u Paretovom frontu
+            roi = best_solution.fitness.values[0]
+            duration = monte_carlo_eval_duration(
+                best_solution, activities, config, streams.np, final=True
+            )
+            result = (roi, duration), hof
+    if return_logbook:
+        return result, logbook
+    return result
+
+
+# ==============================================================================
+# POJEDINAČNI ZADACI (eksperiment, scenarij, ponavljanje)
+# ==============================================================================
+SCENARIOS = ["Random Search (MC)", "GA (samo ROI)", "GA+MC (NSGA-II)"]
+
+# Izvoz za vizualizaciju iz prvog ponavljanja eksperimenta EXPORT_EXPERIMENT:
+# vrsta izvoza -> (scenarij, datoteka, poruka). "pareto" sprema Paretov front
+# NSGA-II, a "convergence" statistiku fitnessa GA (samo ROI) po generaciji
+EXPORT_EXPERIMENT = "A3_Slozeni"
+EXPORTS = {
+    "pareto": ("GA+MC (NSGA-II)", "pareto_front_A3.csv", "Paretov front spremljen"),
+    "convergence": (
+        "GA (samo ROI)",
+        "konvergencija_A3.csv",
+        "Podaci o konvergenciji spremljeni",
+    ),
+}
+
+# Podatci studije: instance (config, activities) po eksperimentu i vrsta
+# izvoza; proces radnik ih prima jednom, kroz inicijalizator bazena procesa
+_study = {"instances": [], "export": None}
+
+
+def init_worker(instances, export=None):
+    """Inicijalizator procesa radnika: sprema podatke svih instanci."""
+    _study["instances"] = instances
+    _study["export"] = export
+
+
+def run_scenario(name, config, activities, streams, return_logbook=False):
+    """Pokreće jedno ponavljanje zadanog scenarija s tokovima 'streams'."""
+    if name == "Random Search (MC)":
+        return run_random_search_once(config, activities, streams)
+    if name == "GA (samo ROI)":
+        return run_ga_once(
+            config,
+            activities,
+            (
+                creator.PackedIndividual
+                if config["PACKED_INDIVIDUALS"]
+                else creator.Individual
+            ),
+            single_objective_fitness,
+            tools.selTournament,
+            algorithms.eaSimple,
+            streams=streams,
+            return_logbook=return_logbook,
+            tournsize=3,
+        )
+    return run_ga_once(
+        config,
+        activities,
+        (
+            creator.PackedIndividualMulti
+            if config["PACKED_INDIVIDUALS"]
+            else creator.IndividualMulti
+        ),
+        multi_objective_fitness,
+        tools.selNSGA2 if config["ENGINE"] == "deap" else nsga2.sel_nsga2,
+        algorithms.eaMuPlusLambda,
+        streams=streams,
+        return_logbook=return_logbook,
+    )
+
+
+def pareto_points(pareto_front, activities, config, streams):
+    """Točke Paretovog fronta (ROI i cilj trajanja) za izvoz."""
+    points = [
+        {
+            "ROI": ind.fitness.values[0],
+            evaluacija.duration_label(config): ind.fitness.values[1],
+        }
+        for ind in pareto_front
+    ]
+    if config["DURATION_OBJECTIVE"] != "mean":
+        # Uz rizični cilj izvozi se i prosječno trajanje svake točke
+        for point, ind in zip(points, pareto_front):
+            point["Trajanje"] = monte_carlo_eval_duration(
+                ind, activities, config, streams.np, final=True
+            )
+    return points
+
+
+def run_task(task):
+    """Izvršava jedan zadatak s vlastitim sjemenom.
+
+    Vraća (roi, trajanje, broj uzorkovanih trajanja, tablica za izvoz ili None).
+    """
+    exp_index, scenario_index, run_index = task
+    config, activities = _study["instances"][exp_index]
+    name = SCENARIOS[scenario_index]
+    export = _study["export"]
+    exported = (
+        export is not None
+        and EXPORTS[export][0] == name
+        and config["name"] == EXPORT_EXPERIMENT
+        and run_index == 0
+    )
+
+    # Vlastiti tokovi slučajnih brojeva, neovisni o redoslijedu izvođenja
+    streams = sjeme.spawn(CONFIG["SEED"], exp_index, scenario_index, run_index)
+    # Broj uzorkovanih trajanja aktivnosti u ovom zadatku
+    monte_carlo.reset_draw_count()
+
+    if exported and name == "GA (samo ROI)":
+        (roi, duration), logbook = run_scenario(
+            name, config, activities, streams, return_logbook=True
+        )
+        return roi, duration, monte_carlo.draw_count(), logbook
+    if name != "GA+MC (NSGA-II)":
+        roi, duration = run_scenario(name, config, activities, streams)
+        return roi, duration, monte_carlo.draw_count(), None
+
+    (roi, duration), pareto_front = run_scenario(name, config, activities, streams)
+    draws = monte_carlo.draw_count()
+    if not exported:
+        return roi, duration, draws, None
+    return (
+        roi,
+        duration,
+        draws,
+        pareto_points(pareto_front, activities, config, streams),
+    )
+
+
+# ==============================================================================
+# GLAVNI PROGRAM ZA PROVOĐENJE SVIH EKSPERIMENATA
+# ==============================================================================
+def optimality_gap(roi, optimal_roi):
+    """Odstupanje ROI-a od egzaktnog optimuma u postotcima."""
+    if optimal_roi <= 0:
+        return 0.0
+    return 100 * (optimal_roi - roi) / optimal_roi
+
+
+def collect_results(instances, results, export=None):
+    """Slaže rezultate zadataka (u redoslijedu zadataka) u tablicu rezultata.
+
+    Tablicu za izvoz (EXPORTS[export]) sprema u CSV čim na nju naiđe.
+    """
+    master_results = []
+    results = iter(results)
+
+    for config, _ in instances:
+        print(f"\n===== REZULTATI EKSPERIMENTA: {config['name']} =====")
+
+        for name in SCENARIOS:
+            print(f"--- Scenarij: {name} ({config['RUNS']} puta) ---")
+            run_rois, run_durations, run_draws = [], [], []
+
+            for i in range(config["RUNS"]):
+                roi, duration, draws, table = next(results)
+                if table is not None:
+                    _, path, message = EXPORTS[export]
+                    pd.DataFrame(table).to_csv(path, index=False)
+                    print(f"    -> {message} u '{path}'")
+                run_rois.append(roi)
+                run_durations.append(duration)
+                run_draws.append(draws)
+                print(
+                    f"  Run {i+1}/{config['RUNS']}: ROI={roi:.2f}, Trajanje={duration:.2f}"
+                )
+
+            master_results.append(
+                {
+                    "Eksperiment": config["name"],
+                    "Scenarij": name,
+                    "ROI_mean": np.mean(run_rois),
+                    "ROI_std": np.std(run_rois),
+                    "Trajanje_mean": np.mean(run_durations),
+                    "Trajanje_std": np.std(run_durations),
+                    "ROI_optimum": config["OPTIMAL_ROI"],
+                    "Gap_pct": optimality_gap(np.mean(run_rois), config["OPTIMAL_ROI"]),
+                    # False: optimum nije dokazan, odstupanje je približno
+                    "Gap_egzaktan": config["OPTIMAL_ROI"] == config["ROI_UPPER_BOUND"],
+                    "MC_uzorci_mean": np.mean(run_draws),
+                }
+            )
+            print("-" * 50)
+
+    return master_results
+
+
+def run_full_study(workers=1, export=None):
+    """Glavna funkcija koja orkestrira sve eksperimente definirane u CONFIG-u.
+
+    Uz workers > 1 zadaci se izvode u bazenu procesa, a rezultati se slažu
+    istim redoslijedom kao sekvencijalno. 'export' je vrsta izvoza za
+    vizualizaciju (ključ EXPORTS) ili None.
+    """
+    instances = []
+
+    for exp_index, exp_config in enumerate(CONFIG["experimental_series"]):
+        # Globalne postavke, nadjačane postavkama eksperimenta
+        config = {
+            **{
+                key: value
+                for key, value in CONFIG.items()
+                if key not in ("SEED", "experimental_series")
+            },
+            **exp_config,
+        }
+
+        print(f"\n===== PRIPREMAM EKSPERIMENT: {config['name']} =====")
+        print(f"Korištena konfiguracija: {config}")
+
+        if config["DURATION_OBJECTIVE"] not in monte_carlo.DURATION_OBJECTIVES:
+            raise ValueError(
+                f"Nepoznat DURATION_OBJECTIVE '{config['DURATION_OBJECTIVE']}'."
+            )
+        if config["DURATION_OBJECTIVE"] == "deadline" and config["DEADLINE"] is None:
+            raise ValueError("Cilj 'deadline' zahtijeva zadani rok (DEADLINE).")
+
+        streams = sjeme.spawn(CONFIG["SEED"], exp_index)
+        if config.get("DATA_PATH") is not None:
+            activities = ucitavanje.load(
+                config["DATA_PATH"], cache_dir=config["DATA_CACHE"]
+            )
+            config["NUM_ACTIVITIES"] = len(activities)
+        elif config["INSTANCE_GENERATOR"] == "vectorized":
+            activities = instance.load_or_generate(
+                config["NUM_ACTIVITIES"],
+                [CONFIG["SEED"], exp_index],
+                {
+                    "max_predecessors": config["MAX_PREDECESSORS"],
+                    **config["INSTANCE_PARAMS"],
+                },
+                cache_dir=config["INSTANCE_CACHE"],
+            )
+        else:
+            activities = generate_data(config, streams.py)
+        if config["CORRELATION_MODEL"] is not None:
+            config["CORRELATION"] = korelacija.CorrelationModel.grouped(
+                config["NUM_ACTIVITIES"],
+                config["CORRELATION_FACTORS"],
+                config["CORRELATION_STRENGTH"],
+                streams.np,
+                dense=config["CORRELATION_MODEL"] == "dense",
+            )
+        evaluacija.check_evaluation_options(config)
+        if config["ISLANDS"] > 1 and config["EARLY_STOPPING"]:
+            raise ValueError("Model otoka ne podržava rano zaustavljanje.")
+        if (
+            config["ISLANDS"] > 1
+            and config["ISLAND_PROCESSES"]
+            and config["EVALUATION_WORKERS"] > 1
+        ):
+            raise ValueError("Procesi otoka ne mogu pokretati bazen za evaluaciju.")
+        if (
+            config["CORRELATION_MODEL"] is not None
+            and config["DURATION_MODE"] == "convolution"
+        ):
+            raise ValueError("Konvolucija pretpostavlja nezavisna trajanja.")
+        if config["DURATION_MODEL"] == "critical_path":
+            if config["DURATION_MODE"] != "monte_carlo":
+                raise ValueError("Kritični put zahtijeva DURATION_MODE 'monte_carlo'.")
+            config["SCHEDULE"] = raspored.CriticalPath(activities)
+        if config["COMMON_RANDOM_NUMBERS"]:
+            config["CRN"] = monte_carlo.CommonRandomNumbers(
+                activities,
+                config["NUM_SIMULATIONS"],
+                streams.np,
+                config.get("CORRELATION"),
+                config.get("SCHEDULE"),
+            )
+        if config["DURATION_MODE"] == "analytic":
+            config["ANALYTIC"] = monte_carlo.AnalyticDuration(activities)
+        elif config["DURATION_MODE"] == "convolution":
+            config["DISTRIBUTION"] = distribucija.DistributionEngine(
+                activities, config["GRID_STEP"]
+            )
+
+        # Egzaktni optimum ROI-a (0/1 ruksak) kao referenca za odstupanje scenarija;
+        # na prevelikim instancama najbolje nađeno rješenje uz gornju granicu
+        cost, roi = evaluacija.metric_arrays(activities)
+        config["OPTIMAL_ROI"], _, config["ROI_UPPER_BOUND"] = ruksak.solve_knapsack(
+            cost, roi, config["BUDGET"]
+        )
+        if config["OPTIMAL_ROI"] == config["ROI_UPPER_BOUND"]:
+            print(f"Optimalni ROI (egzaktno rješenje): {config['OPTIMAL_ROI']:.2f}")
+        else:
+            print(
+                f"Optimalni ROI (približno): {config['OPTIMAL_ROI']:.2f}, "
+                f"gornja granica {config['ROI_UPPER_BOUND']:.2f}"
+            )
+        instances.append((config, activities))
+
+    tasks = [
+        (exp_index, scenario_index, run_index)
+        for exp_index, (config, _) in enumerate(instances)
+        for scenario_index in range(len(SCENARIOS))
+        for run_index in range(config["RUNS"])
+    ]
+
+    if workers > 1:
+        print(f"\nPokrećem {len(tasks)} zadataka na {workers} procesa...")
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=init_worker,
+            initargs=(instances, export),
+        ) as executor:
+            master_results = collect_results(
+                instances, executor.map(run_task, tasks), export
+            )
+    else:
+        init_worker(instances, export)
+        master_results = collect_results(instances, map(run_task, tasks), export)
+
+    df = pd.DataFrame(master_results)
+    df.to_csv("master_rezultati.csv", index=False)
+    print("\n\n===== SVI EKSPERIMENTI SU ZAVRŠENI =====")
+    print("Konačni rezultati svih eksperimenata:")
+    print(df.to_string())
+    print("\nRezultati spremljeni u 'master_rezultati.csv'")
@@ -0,0 +1,51 @@
+"""Deterministični tokovi slučajnih brojeva po zadatku - diplomski rad - Neven Nižić"""
+
+import random
+
+import numpy as np
+
+import monte_carlo
+
+
+class Streams:
+    """Generatori jednog zadatka: NumPy Generator ('np') i random.Random ('py')."""
+
+    def __init__(self, np_rng, py_rng):
+        self.np = np_rng
+        self.py = py_rng
+
+
+def spawn(root_seed, *indices):
+    """Vraća tokove za zadatak određen indeksima (eksperiment[, scenarij, ponavljanje]).
+
+    Sjeme se izvodi iz korijenskog SeedSequence preko spawn_key, pa tok ovisi
+    samo o korijenskom sjemenu i indeksima zadatka, a ne o redoslijedu ili
+    procesu u kojem se zadatak izvodi.
+    """
+    seed_seq = np.random.SeedSequence(root_seed, spawn_key=indices)
+    np_seed, py_seed = seed_seq.spawn(2)
+    py_rng = random.Random(int(py_seed.generate_state(1, np.uint64)[0]))
+    return Streams(np.random.default_rng(np_seed), py_rng)
+
+
+def global_streams():
+    """Tokovi nad globalnim generatorima (modul random i zajednički MC generator)."""
+    return Streams(monte_carlo.get_rng(), random)
+
+
+def seed_global_random(streams):
+    """Postavlja globalni random iz toka zadatka.
+
+    DEAP operatori (cxTwoPoint, mutFlipBit, selTournament, ...) uvijek koriste
+    globalni modul random, pa ga je prije evolucije potrebno postaviti iz toka.
+    """
+    if streams.py is not random:
+        random.seed(streams.py.getrandbits(64))
+
+
+def split(streams, count):
+    """Neovisni tokovi za 'count' podzadataka (npr. otoke GA) iz toka zadatka."""
+    return [
+        Streams(np_rng, random.Random(streams.py.getrandbits(64)))
+        for np_rng in streams.np.spawn(count)
+    ]
@@ -0,0 +1,6 @@
+"""Zajednička postavka testova: moduli iz mape 'kodovi' uvoze se izravno."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
@@ -0,0 +1,35 @@
+"""Testovi pohlepne inicijalizacije i slučajnih izvedivih jedinki."""
+
+import numpy as np
+
+import heuristike
+
+BUDGET = 5000
+
+
+def test_greedy_skips_activity_over_budget():
+    cost = np.array([6000.0, 100.0, 100.0, 100.0])
+    ratio = np.array([10.0, 1.0, 1.0, 1.0])
+    population = heuristike.greedy_population(
+        cost, ratio, BUDGET, 8, np.random.default_rng(0)
+    )
+    assert (population == [False, True, True, True]).all()
+
+
+def test_greedy_fills_remaining_budget():
+    cost = np.array([100.0, 4950.0, 100.0, 100.0])
+    ratio = np.array([4.0, 3.0, 1.0, 1.0])
+    population = heuristike.greedy_population(
+        cost, ratio, BUDGET, 8, np.random.default_rng(0), noise=0.0
+    )
+    assert (population == [True, False, True, True]).all()
+
+
+def test_random_feasible_individuals_are_maximal():
+    rng = np.random.default_rng(1)
+    cost = rng.uniform(50, 1500, size=40)
+    population = heuristike.random_feasible_population(cost, BUDGET, 200, rng)
+    spent = population @ cost
+    assert (spent <= BUDGET).all()
+    cheapest_left = np.where(population, np.inf, cost).min(axis=1)
+    assert (cheapest_left > BUDGET - spent).all()
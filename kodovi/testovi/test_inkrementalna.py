@@ -0,0 +1,45 @@
+"""Testovi inkrementalne (delta) evaluacije."""
+
+import numpy as np
+
+import inkrementalna
+import instance
+import monte_carlo
+
+
+def make_config(activities):
+    return {
+        "BUDGET": 0.4 * activities.cost.sum(),
+        "NUM_SIMULATIONS": 50,
+        "CRN": monte_carlo.CommonRandomNumbers(
+            activities, 50, np.random.default_rng(0)
+        ),
+        "ANALYTIC": monte_carlo.AnalyticDuration(activities),
+    }
+
+
+def test_single_objective_carries_only_cost_and_roi():
+    activities = instance.generate(40, 0, {"max_predecessors": 0})
+    delta = inkrementalna.DeltaEvaluator(activities, make_config(activities))
+    individual = type("Individual", (list,), {})([1, 0] * 20)
+    delta(individual)
+    delta.mutate(individual, indpb=0.5)
+    cached = individual.aggregates
+    assert cached.durations is None and cached.mean_duration is None
+    selected = np.asarray(individual, dtype=bool)
+    assert np.isclose(cached.roi, activities.roi[selected].sum())
+
+
+def test_multi_objective_updates_durations_after_flips():
+    activities = instance.generate(40, 1, {"max_predecessors": 0})
+    config = make_config(activities)
+    delta = inkrementalna.DeltaEvaluator(activities, config, multi_objective=True)
+    individual = type("Individual", (list,), {})([0, 1] * 20)
+    delta(individual)
+    delta.mutate(individual, indpb=0.5)
+    cached = individual.aggregates
+    selected = np.asarray(individual, dtype=float)
+    assert np.allclose(cached.durations, config["CRN"].samples @ selected)
+    assert np.isclose(
+        cached.mean_duration, config["ANALYTIC"].mean_duration(individual)
+    )
@@ -0,0 +1,42 @@
+"""Testovi trajanja projekta po kritičnom putu."""
+
+import numpy as np
+
+import instance
+import raspored
+
+
+def longest_path(predecessors, durations, selected):
+    """Referentni izračun: neodabrane aktivnosti traju nula, ali prenose ovisnosti."""
+    finish = {}
+    for i in range(len(predecessors)):
+        start = max((finish[p] for p in predecessors[i]), default=0.0)
+        finish[i] = start + (durations[i] if selected[i] else 0.0)
+    return max(finish.values(), default=0.0)
+
+
+def test_chain_through_unselected_activity_is_kept():
+    # A -> B -> C, B nije odabran: C i dalje počinje nakon A
+    activities = instance.generate(3, 0, {"max_predecessors": 0})
+    activities.predecessor_offsets[:] = [0, 0, 1, 2]
+    activities.predecessor_indices = np.array([0, 1])
+    schedule = raspored.CriticalPath(activities)
+    samples = np.array([[4.0, 6.0], [1.0, 2.0]])
+    assert schedule.makespans(samples, np.array([0, 2])).tolist() == [10.0, 3.0]
+
+
+def test_matches_reference_and_reuses_buffers():
+    activities = instance.generate(60, 4, {"max_predecessors": 3})
+    schedule = raspored.CriticalPath(activities)
+    predecessors = activities.predecessor_lists()
+    rng = np.random.default_rng(1)
+    for _ in range(5):
+        selected = rng.random(60) < 0.4
+        columns = np.flatnonzero(selected)
+        samples = rng.uniform(1, 10, (7, len(columns)))
+        totals = schedule.makespans(samples, columns)
+        for row in range(7):
+            durations = np.zeros(60)
+            durations[columns] = samples[row]
+            expected = longest_path(predecessors, durations, selected)
+            assert np.isclose(totals[row], expected)
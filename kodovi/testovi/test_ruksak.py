@@ -0,0 +1,66 @@
+"""Testovi egzaktnog i približnog rješenja problema ruksaka."""
+
+import time
+
+import numpy as np
+
+import instance
+import ruksak
+
+
+def test_dp_value_matches_dp_with_selection():
+    activities = instance.generate(500, 3)
+    optimum, selection = ruksak.knapsack_dp(activities.cost, activities.roi, 2500)
+    assert activities.cost[selection].sum() <= 2500
+    assert np.isclose(activities.roi[selection].sum(), optimum)
+    assert np.isclose(
+        ruksak.knapsack_dp_value(activities.cost, activities.roi, 2500), optimum
+    )
+
+
+def test_large_instance_finishes_with_exact_value():
+    # 10 000 × 5001 ćelija je iznad MAX_DP_CELLS; prije se to rješavalo
+    # iscrpnim B&B-om koji nije završavao
+    activities = instance.generate(10_000, 1)
+    started = time.perf_counter()
+    optimum, _, bound = ruksak.solve_knapsack(activities.cost, activities.roi, 5000)
+    assert time.perf_counter() - started < 10
+    assert optimum == bound
+    assert np.isclose(
+        optimum, ruksak.knapsack_dp(activities.cost, activities.roi, 5000)[0]
+    )
+
+
+def test_branch_and_bound_node_limit_returns_bound():
+    activities = instance.generate(10_000, 1)
+    optimum = ruksak.knapsack_dp_value(activities.cost, activities.roi, 5000)
+    started = time.perf_counter()
+    value, selection, bound = ruksak.knapsack_branch_and_bound(
+        activities.cost, activities.roi, 5000, max_nodes=20_000
+    )
+    assert time.perf_counter() - started < 10
+    assert activities.cost[selection].sum() <= 5000
+    assert np.isclose(activities.roi[selection].sum(), value)
+    assert value <= optimum + 1e-9 <= bound + 2e-9
+    assert (
+        bound
+        <= ruksak.fractional_upper_bound(activities.cost, activities.roi, 5000) + 1e-9
+    )
+
+
+def test_fractional_costs_use_branch_and_bound():
+    rng = np.random.default_rng(0)
+    cost = rng.uniform(1, 10, 12)
+    value = rng.uniform(0, 5, 12)
+    optimum, selection, bound = ruksak.solve_knapsack(cost, value, 20.5)
+    best = max(
+        value[mask].sum()
+        for mask in (
+            np.array([(bits >> i) & 1 for i in range(12)], dtype=bool)
+            for bits in range(1 << 12)
+        )
+        if cost[mask].sum() <= 20.5
+    )
+    assert optimum == bound
+    assert np.isclose(optimum, best)
+    assert cost[selection].sum() <= 20.5
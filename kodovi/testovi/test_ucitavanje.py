@@ -0,0 +1,83 @@
+"""Testovi učitavanja portfelja iz CSV datoteka."""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import aktivnosti
+import heuristike
+import ucitavanje
+
+ROWS = {
+    "id": [10, 11, 12, 13],
+    "cost": [100.0, 0.0, 50.0, 80.0],
+    "roi": [2.0, 1.5, 1.0, 2.4],
+    "optimistic": [5, 6, 5, 7],
+    "realistic": [10, 12, 10, 15],
+    "pessimistic": [20, 30, 25, 35],
+    "predecessors": ["", "10", "10;11", ""],
+}
+
+
+def write_csv(path, **changes):
+    table = pd.DataFrame({**ROWS, **changes})
+    table.to_csv(path, index=False)
+    return str(path)
+
+
+def test_reads_columns_and_predecessors_in_chunks(tmp_path):
+    activities = ucitavanje.read_table(write_csv(tmp_path / "p.csv"), chunk_size=3)
+    assert isinstance(activities, aktivnosti.ActivitySet)
+    assert activities.ids.tolist() == ROWS["id"]
+    assert activities.cost.tolist() == ROWS["cost"]
+    assert activities.predecessor_lists() == [[], [0], [0, 1], []]
+
+
+def test_zero_cost_row_has_zero_ratio_and_is_kept_by_heuristics(tmp_path):
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        activities = ucitavanje.read_table(write_csv(tmp_path / "p.csv"))
+        cost, ratio = heuristike.cost_and_ratio(activities)
+        greedy = heuristike.greedy_population(
+            cost, ratio, 120, 20, np.random.default_rng(0)
+        )
+        population = np.ones((1, len(cost)), dtype=bool)
+        heuristike.repair_population(population, cost, ratio, 120)
+    assert np.all(np.isfinite(ratio)) and ratio[1] == 0
+    # Aktivnost bez troška uvijek je u pohlepnom rješenju i nikad se ne izbacuje
+    assert greedy[:, 1].all()
+    assert population[0, 1]
+    assert population[0] @ cost <= 120
+
+
+@pytest.mark.parametrize(
+    "changes, message",
+    [
+        ({"cost": [100.0, -1.0, 50.0, 80.0]}, "redak 1"),
+        ({"realistic": [10, 40, 10, 15]}, "redak 1"),
+        ({"roi": ["2.0", "x", "1.0", "2.4"]}, "neispravna vrijednost"),
+        ({"id": [10, 10, 12, 13]}, "jedinstveni"),
+        ({"predecessors": ["", "99", "", ""]}, "nepostojećim"),
+    ],
+)
+def test_rejects_invalid_tables(tmp_path, changes, message):
+    with pytest.raises(ValueError, match=message):
+        ucitavanje.read_table(write_csv(tmp_path / "p.csv", **changes))
+
+
+def test_missing_column(tmp_path):
+    path = tmp_path / "p.csv"
+    pd.DataFrame(ROWS).drop(columns="roi").to_csv(path, index=False)
+    with pytest.raises(ValueError, match="roi"):
+        ucitavanje.read_table(str(path))
+
+
+def test_cache_memory_maps_converted_table(tmp_path):
+    path = write_csv(tmp_path / "p.csv")
+    first = ucitavanje.load(path, cache_dir=str(tmp_path / "cache"))
+    second = ucitavanje.load(path, cache_dir=str(tmp_path / "cache"))
+    assert first.source == second.source
+    assert isinstance(second.cost, np.memmap)
+    assert ucitavanje.load(first.source).cost.tolist() == ROWS["cost"]
@@ -0,0 +1,179 @@
+"""Učitavanje portfelja aktivnosti iz CSV/Parquet datoteka - zajednički modul - diplomski rad - Neven Nižić"""
+
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+import aktivnosti
+import instance
+
+# Obavezni stupci tablice; 'predecessors' je neobavezan (id-evi odvojeni s ';'
+# u CSV-u, lista ili isti tekst u Parquetu)
+REQUIRED = ("id",) + aktivnosti.FIELDS
+PREDECESSORS = "predecessors"
+SEPARATOR = ";"
+
+# Broj redaka koji se čita odjednom
+CHUNK_SIZE = 50_000
+
+DTYPES = {"id": "int64", **{field: "float64" for field in aktivnosti.FIELDS}}
+
+
+def _read_csv(path, chunk_size):
+    """Blokovi CSV tablice kao DataFrame-ovi s brojčanim stupcima.
+
+    Id se čita kao float64, pa prazno polje postaje NaN koje _check_chunk
+    javlja s brojem retka.
+    """
+    dtypes = {**dict.fromkeys(DTYPES, "float64"), PREDECESSORS: "string"}
+    try:
+        yield from pd.read_csv(
+            path,
+            usecols=lambda name: name in dtypes,
+            dtype=dtypes,
+            chunksize=chunk_size,
+        )
+    except ValueError as error:
+        raise ValueError(
+            f"{path}: neispravna vrijednost u tablici ({error})"
+        ) from error
+
+
+def _read_parquet(path, chunk_size):
+    """Blokovi Parquet tablice kao DataFrame-ovi (tipovi se provjeravaju kasnije)."""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as error:
+        raise ImportError(
+            "Čitanje Parquet datoteka zahtijeva paket pyarrow."
+        ) from error
+    table = pq.ParquetFile(path)
+    columns = [name for name in table.schema_arrow.names if name in REQUIRED]
+    if PREDECESSORS in table.schema_arrow.names:
+        columns.append(PREDECESSORS)
+    for batch in table.iter_batches(batch_size=chunk_size, columns=columns):
+        yield batch.to_pandas()
+
+
+def _check_chunk(frame, start, path):
+    """Provjerava stupce, tipove i vrijednosti bloka; vraća rječnik nizova."""
+    missing = [name for name in REQUIRED if name not in frame.columns]
+    if missing:
+        raise ValueError(f"{path}: nedostaju stupci {missing}")
+    columns = {}
+    for name, dtype in DTYPES.items():
+        values = frame[name]
+        if not pd.api.types.is_numeric_dtype(values):
+            raise ValueError(f"{path}: stupac '{name}' nije brojčani")
+        values = values.to_numpy(dtype=float)
+        bad = ~np.isfinite(values)
+        if name == "id":
+            bad |= values != np.round(values)
+        if bad.any():
+            row = start + np.flatnonzero(bad)[0]
+            raise ValueError(f"{path}: neispravna vrijednost '{name}' u retku {row}")
+        columns[name] = values.astype(dtype)
+
+    low, mode, high = (columns[name] for name in aktivnosti.FIELDS[1:4])
+    invalid = (columns["cost"] < 0) | (low < 0) | (low > mode) | (mode > high)
+    if invalid.any():
+        row = start + np.flatnonzero(invalid)[0]
+        raise ValueError(
+            f"{path}: redak {row} mora imati cost >= 0 i "
+            "0 <= optimistic <= realistic <= pessimistic"
+        )
+
+    counts = np.zeros(len(frame), dtype=np.int64)
+    references = np.zeros(0, dtype=np.int64)
+    if PREDECESSORS in frame.columns:
+        lists = frame[PREDECESSORS].reset_index(drop=True)
+        if pd.api.types.is_string_dtype(lists):
+            lists = lists.fillna("").str.split(SEPARATOR)
+        items = lists.explode().dropna().astype(str).str.strip()
+        items = items[items != ""]
+        numbers = pd.to_numeric(items, errors="coerce")
+        if numbers.isna().any():
+            row = start + numbers.index[numbers.isna()][0]
+            raise ValueError(f"{path}: neispravni prethodnici u retku {row}")
+        counts = np.bincount(items.index, minlength=len(frame)).astype(np.int64)
+        references = numbers.to_numpy(dtype=np.int64)
+    columns["counts"] = counts
+    columns["references"] = references
+    return columns
+
+
+def read_table(path, chunk_size=CHUNK_SIZE):
+    """Čita tablicu aktivnosti (.csv ili .parquet) u blokovima; vraća ActivitySet.
+
+    Svaki blok od 'chunk_size' redaka provjerava se i pretvara u NumPy nizove,
+    pa se u memoriji nikad ne drži cijela tablica kao DataFrame. Prethodnici
+    se zadaju id-evima aktivnosti i pretvaraju u indekse redaka.
+    """
+    if path.endswith((".parquet", ".pq")):
+        chunks = _read_parquet(path, chunk_size)
+    else:
+        chunks = _read_csv(path, chunk_size)
+    parts, start = [], 0
+    for frame in chunks:
+        parts.append(_check_chunk(frame, start, path))
+        start += len(frame)
+    if not parts:
+        raise ValueError(f"{path}: tablica nema aktivnosti")
+    columns = {
+        name: np.concatenate([part[name] for part in parts])
+        for name in DTYPES.keys() | {"counts", "references"}
+    }
+
+    ids = pd.Index(columns.pop("id"))
+    if not ids.is_unique:
+        raise ValueError(f"{path}: id-evi aktivnosti nisu jedinstveni")
+    indices = ids.get_indexer(columns.pop("references"))
+    if (indices < 0).any():
+        raise ValueError(f"{path}: prethodnik s nepostojećim id-em")
+    offsets = np.zeros(len(ids) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(columns.pop("counts"))
+    return aktivnosti.ActivitySet.from_columns(
+        {
+            "ids": ids.to_numpy(dtype=np.int64),
+            **columns,
+            "predecessor_offsets": offsets,
+            "predecessor_indices": indices.astype(np.int64),
+        }
+    )
+
+
+def is_converted(path):
+    """Je li 'path' već pretvorena instanca (ActivitySet.save)."""
+    return path.endswith(".npz") or os.path.isfile(os.path.join(path, "cost.npy"))
+
+
+def cache_path(cache_dir, path):
+    """Putanja pretvorene tablice, određena s (putanja, veličina, vrijeme izmjene).
+
+    Izmijenjena izvorna datoteka dobiva novu putanju, pa se ponovno pretvara.
+    """
+    info = os.stat(path)
+    description = f"{os.path.abspath(path)}|{info.st_size}|{info.st_mtime_ns}"
+    key = hashlib.sha1(description.encode()).hexdigest()[:16]
+    name = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(cache_dir, f"portfelj_{name}_{key}")
+
+
+def load(path, cache_dir=None, chunk_size=CHUNK_SIZE):
+    """Portfelj aktivnosti iz tablice ili iz već pretvorenih nizova.
+
+    Pretvorena instanca (.npz ili direktorij .npy datoteka) učitava se
+    izravno, direktorij memorijskim mapiranjem. Uz 'cache_dir' tablica se
+    pretvara samo prvi put, a sljedeća učitavanja mapiraju spremljene nizove.
+    """
+    if is_converted(path):
+        return aktivnosti.ActivitySet.load(path)
+    if cache_dir is None:
+        return read_table(path, chunk_size)
+    converted = cache_path(cache_dir, path)
+    if not os.path.exists(converted):
+        os.makedirs(cache_dir, exist_ok=True)
+        instance.save_atomic(read_table(path, chunk_size), converted)
+    return aktivnosti.ActivitySet.load(converted)
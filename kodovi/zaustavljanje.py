@@ -0,0 +1,179 @@
+"""Rano zaustavljanje genetskog algoritma - zajednički modul - diplomski rad - Neven Nižić"""
+
+import time
+
+from deap import algorithms, tools
+
+import evaluacija
+import ruksak
+
+# Razlozi zaustavljanja zapisani u logbook
+STOP_TARGET = "gornja_granica"
+STOP_STAGNATION = "stagnacija"
+STOP_TIME = "vremensko_ogranicenje"
+STOP_NGEN = "ngen"
+
+
+class TerminationController:
+    """Prati napredak GA i odlučuje kada ga zaustaviti.
+
+    Kriteriji: najbolji ROI dosegnuo je ciljnu vrijednost (gornju granicu),
+    kuća slavnih se nije promijenila 'stagnation' generacija ili je isteklo
+    'time_limit' sekundi. None isključuje pojedini kriterij.
+    """
+
+    def __init__(self, target=None, stagnation=None, time_limit=None):
+        self.target = target
+        self.stagnation = stagnation
+        self.time_limit = time_limit
+        self.start()
+
+    @classmethod
+    def from_config(cls, config, activities):
+        """Kontroler iz CONFIG-a; cilj je gornja granica optimuma (ROI_UPPER_BOUND,
+        jednaka egzaktnom optimumu kad je dokazan) ili, ako nije poznata, LP granica.
+        """
+        target = config.get("ROI_UPPER_BOUND")
+        if target is None:
+            cost, roi = evaluacija.metric_arrays(activities)
+            target = ruksak.fractional_upper_bound(cost, roi, config["BUDGET"])
+        return cls(
+            target=target,
+            stagnation=config["STAGNATION_GENERATIONS"],
+            time_limit=config["TIME_LIMIT"],
+        )
+
+    def start(self):
+        """Pokreće mjerenje vremena i briše povijest poboljšanja."""
+        self.started = time.perf_counter()
+        self.last_snapshot = None
+        self.last_improvement = 0
+
+    def elapsed(self):
+        """Sekunde od početka evolucije."""
+        return time.perf_counter() - self.started
+
+    def check(self, gen, best_roi, snapshot):
+        """Vraća razlog zaustavljanja nakon generacije 'gen' ili None.
+
+        'snapshot' je usporediv sažetak kuće slavnih; njegova promjena znači
+        poboljšanje.
+        """
+        if snapshot != self.last_snapshot:
+            self.last_snapshot = snapshot
+            self.last_improvement = gen
+        if self.target is not None and best_roi >= self.target - 1e-9:
+            return STOP_TARGET
+        if (
+            self.stagnation is not None
+            and gen - self.last_improvement >= self.stagnation
+        ):
+            return STOP_STAGNATION
+        if self.time_limit is not None and self.elapsed() >= self.time_limit:
+            return STOP_TIME
+        return None
+
+    def check_halloffame(self, gen, halloffame):
+        """check() za DEAP HallOfFame ili ParetoFront."""
+        values = sorted(ind.fitness.values for ind in halloffame)
+        best_roi = max(value[0] for value in values)
+        return self.check(gen, best_roi, tuple(values))
+
+    def finish(self, logbook, gen, reason):
+        """Zapisuje razlog i generaciju zaustavljanja u logbook."""
+        logbook.stop_reason = reason or STOP_NGEN
+        logbook.stop_gen = gen
+        logbook[-1]["stop"] = logbook.stop_reason
+
+
+# ==============================================================================
+# DEAP PETLJE S RANIM ZAUSTAVLJANJEM
+# ==============================================================================
+def _evaluate_invalid(individuals, toolbox):
+    """Evaluira jedinke bez valjanog fitnessa; vraća njihov broj."""
+    invalid_ind = [ind for ind in individuals if not ind.fitness.valid]
+    fitnesses = toolbox.map(toolbox.evaluate, invalid_ind)
+    for ind, fit in zip(invalid_ind, fitnesses):
+        ind.fitness.values = fit
+    return len(invalid_ind)
+
+
+def _record(logbook, gen, nevals, population, stats, controller, verbose):
+    """Bilježi generaciju zajedno s proteklim vremenom."""
+    record = stats.compile(population) if stats is not None else {}
+    logbook.record(gen=gen, nevals=nevals, time=controller.elapsed(), **record)
+    if verbose:
+        print(logbook.stream)
+
+
+def ea_simple(
+    population,
+    toolbox,
+    cxpb,
+    mutpb,
+    ngen,
+    controller,
+    halloffame,
+    stats=None,
+    verbose=False,
+):
+    """algorithms.eaSimple s provjerom kontrolera nakon svake generacije."""
+    logbook = tools.Logbook()
+    logbook.header = ["gen", "nevals", "time"] + (stats.fields if stats else [])
+    controller.start()
+
+    nevals = _evaluate_invalid(population, toolbox)
+    halloffame.update(population)
+    _record(logbook, 0, nevals, population, stats, controller, verbose)
+    reason = controller.check_halloffame(0, halloffame)
+
+    gen = 0
+    while reason is None and gen < ngen:
+        gen += 1
+        offspring = toolbox.select(population, len(population))
+        offspring = algorithms.varAnd(offspring, toolbox, cxpb, mutpb)
+        nevals = _evaluate_invalid(offspring, toolbox)
+        halloffame.update(offspring)
+        population[:] = offspring
+        _record(logbook, gen, nevals, population, stats, controller, verbose)
+        reason = controller.check_halloffame(gen, halloffame)
+
+    controller.finish(logbook, gen, reason)
+    return population, logbook
+
+
+def ea_mu_plus_lambda(
+    population,
+    toolbox,
+    mu,
+    lambda_,
+    cxpb,
+    mutpb,
+    ngen,
+    controller,
+    halloffame,
+    stats=None,
+    verbose=False,
+):
+    """algorithms.eaMuPlusLambda s provjerom kontrolera nakon svake generacije."""
+    logbook = tools.Logbook()
+    logbook.header = ["gen", "nevals", "time"] + (stats.fields if stats else [])
+    controller.start()
+
+    nevals = _evaluate_invalid(population, toolbox)
+    halloffame.update(population)
+    _record(logbook, 0, nevals, population, stats, controller, verbose)
+    reason = controller.check_halloffame(0, halloffame)
+
+    gen = 0
+    while reason is None and gen < ngen:
+        gen += 1
+        offspring = algorithms.varOr(population, toolbox, lambda_, cxpb, mutpb)
+        nevals = _evaluate_invalid(offspring, toolbox)
+        halloffame.update(offspring)
+        population[:] = toolbox.select(population + offspring, mu)
+        _record(logbook, gen, nevals, population, stats, controller, verbose)
+        reason = controller.check_halloffame(gen, halloffame)
+
+    controller.finish(logbook, gen, reason)
+    return population, logbook